@@ -8,8 +8,14 @@ Global and benchmark-specific options can be configured at the top, and
 runs can be added/removed/customized in each relevant section.
 """
 
+import concurrent.futures
+import functools
+import gc
 import timeit
 import os
+import numpy as np
+import matplotlib
+matplotlib.use("Agg") # Plots are only ever saved to file
 import matplotlib.pyplot as plt
 from pychomp import *
 
@@ -21,7 +27,9 @@ cutoff_time: float
     If a run takes this long, skip to the next method instead of the
     next run. Can be set to `float("Inf")` to avoid this behavior.
 iterations: int
-    The number of times each benchmark is run for. Results are averaged.
+    The number of timing repetitions of each run. Each repetition loops
+    the run enough times to take at least 0.2 seconds, and the fastest
+    repetition is reported.
 plot_filename: str, optional
     Filename of the plot within the `pyCHomP2/examples/plots` directory.
     If not set, the plot will not be generated.
@@ -32,13 +40,80 @@ verbose: bool
     Whether to print to command line.
 progress: bool
     Whether to print progress bars for homology computations
+processes: int, optional
+    Maximum number of worker processes used to time methods. Defaults to
+    1, timing methods one at a time so the reported times are free of
+    contention between methods. Larger values (or None, for the number
+    of processors) run methods concurrently, which only shortens the
+    wall-clock time of the script: the reported times then include CPU
+    and memory-bandwidth contention, peak memory grows with the number
+    of workers, and progress output interleaves.
 """
 cutoff_time = 20.0
-iterations = 20
+iterations = 5
 plot_filename = "benchmark.png"
 report_filename = "benchmark.txt"
 verbose = True
 progress = True
+processes = 1
+
+
+def no_setup(**kwargs):
+    pass
+
+
+# Caches of graded complexes shared across the repetitions of a run. They
+# are registered as they are defined, so a worker forked before a later
+# section's cache exists only clears the caches it has.
+graded_complex_caches = []
+
+
+def time_method(
+    method_config,
+    run_configs,
+    stmt_function,
+    setup_function,
+    iterations,
+    cutoff_time
+):
+    """
+    Times every run of a single method, stopping early once a run
+    exceeds `cutoff_time`. Executed in a worker process by `benchmark`.
+
+    The number of loops per repetition is chosen by `Timer.autorange`;
+    runs slower than `cutoff_time` are reported from that calibration
+    alone and end the method.
+
+    Returns
+    -------
+    list
+        Best per-loop time of each completed run.
+    """
+    times = []
+    for run_config in run_configs.values():
+        timer = timeit.Timer(
+            stmt=functools.partial(stmt_function, **method_config,
+                                   **run_config),
+            setup=functools.partial(setup_function, **method_config,
+                                    **run_config)
+        )
+        number, total = timer.autorange()
+        exceeded = total / number > cutoff_time
+        if exceeded:
+            times.append(total / number)
+        else:
+            times.append(min(timer.repeat(repeat=iterations, number=number))
+                         / number)
+
+        # Release the run's graded complex, including the cached copy,
+        # before the next one is built
+        globals().pop("gradX", None)
+        for cache in graded_complex_caches:
+            cache.cache_clear()
+        gc.collect()
+        if exceeded:
+            break
+    return times
 
 
 def benchmark(
@@ -47,26 +122,35 @@ def benchmark(
     method_configs,
     run_configs,
     stmt_function,
-    setup_function=(lambda **kw: None),
+    setup_function=no_setup,
     verbose=True,
-    file=None
+    file=None,
+    processes=None
 ):
     """
     Runs a specified benchmark using the `timeit` package.
 
+    Methods are independent of each other, so each one is timed in its
+    own worker process; results are reported in method order once the
+    corresponding worker finishes.
+
     Parameters
     ----------
     name: str
     iterations: int
+        Number of timing repetitions of each run.
     method_configs, run_configs: dict
         See examples of config formatting below. These are arguments
         passed to the `stmt_function` and `setup_function` parameters.
     stmt_function, setup_function: function
-        Passed to the `timeit` function.
+        Passed to the `timeit` function. Must be defined at module
+        level so they can be sent to worker processes.
     verbose: bool
         Whether to print to command line.
     file: file, optional
         Logging file.
+    processes: int, optional
+        Maximum number of worker processes.
 
     Returns
     -------
@@ -84,70 +168,62 @@ def benchmark(
         print("*" * (len(name) + 4), file=file)
 
     times_dict = {} # Stores times for return
-    method_counter = 1
     num_method = len(method_configs)
     num_run = len(run_configs)
 
-    # Complete all runs for each method before iterating to next method.
-    for method, method_config in method_configs.items():
-        times = []
-        run_counter = 1
-
-        method_string = f"{method} ({method_counter}/{num_method})"
-        if verbose:
-            print(method_string)
-            print("-" * len(method_string))
-        if file is not None:
-            print(method_string, file=file)
-            print("-" * len(method_string), file = file)
-
-        for run, run_config in run_configs.items():
-
-            times.append(timeit.timeit(
-                stmt="stmt_function(**method_config, **run_config)",
-                setup="setup_function(**method_config, **run_config)",
-                number=iterations,
-                globals={"stmt_function": stmt_function,
-                         "setup_function": setup_function,
-                         "method_config": method_config,
-                         "run_config": run_config}
-            ) / iterations)
-
-            run_string = f"Run: {run} ({run_counter}/{num_run}) Time: {times[-1]:.6f}"
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = {
+            method: executor.submit(time_method, method_config, run_configs,
+                                    stmt_function, setup_function,
+                                    iterations, cutoff_time)
+            for method, method_config in method_configs.items()
+        }
+
+        for method_counter, (method, future) in enumerate(futures.items(), 1):
+            times = future.result()
+            times_dict[method] = times
+            if not verbose and file is None:
+                continue
+
+            method_string = f"{method} ({method_counter}/{num_method})"
             if verbose:
-                print(run_string)
+                print(method_string)
+                print("-" * len(method_string))
             if file is not None:
-                print(run_string, file=file)
-
-            if times[-1] > cutoff_time:
-                break
-            run_counter += 1
+                print(method_string, file=file)
+                print("-" * len(method_string), file = file)
 
-        times_dict[method] = times
-        method_counter += 1
+            for run_counter, (run, time) in enumerate(zip(run_configs, times), 1):
+                run_string = f"Run: {run} ({run_counter}/{num_run}) Time: {time:.6f}"
+                if verbose:
+                    print(run_string)
+                if file is not None:
+                    print(run_string, file=file)
 
-        if verbose:
-            print("-" * len(method_string), end="\n\n\n")
-        if file is not None:
-            print("-" * len(method_string), end="\n\n\n", file=file)
+            if verbose:
+                print("-" * len(method_string), end="\n\n\n")
+            if file is not None:
+                print("-" * len(method_string), end="\n\n\n", file=file)
 
     return times_dict
 
 
-# Plot configurations
-fig, axs = plt.subplots(ncols=4, nrows=3,
-                        layout="constrained", figsize=(30, 20))
-fig.suptitle("pyCHomP Benchmarks")
+if __name__ == "__main__":
+    # Plot configurations
+    if plot_filename is not None:
+        fig, axs = plt.subplots(ncols=4, nrows=3,
+                                layout="constrained", figsize=(30, 20))
+        fig.suptitle("pyCHomP Benchmarks")
 
-# Report file configuration
-if report_filename is not None:
-    os.makedirs("examples/reports", exist_ok=True)
-    path = f"examples/reports/{report_filename}"
-    if os.path.exists(path):
-        os.remove(path)
-    f = open(path, "x")
-else:
-    f = None
+    # Report file configuration
+    if report_filename is not None:
+        os.makedirs("examples/reports", exist_ok=True)
+        path = f"examples/reports/{report_filename}"
+        if os.path.exists(path):
+            os.remove(path)
+        f = open(path, "x")
+    else:
+        f = None
 
 
 """
@@ -161,27 +237,47 @@ The experiment is run for all Sn where `n` < `k`. Each Sn is made up of
 `n`-cells and their closure.
 """
 
-def CubicalSnHomology_instantiate(n, k, length, **kwargs):
+def CubicalSnHomology_grading(n, k, dim, shape, first, second):
+    """
+    Returns a boolean array marking the cells graded 1, i.e. those not
+    in the embedded Sn, given the bitmasks of `cubical_cell_masks`.
+
+    A cell lies in the embedded Sn when its dimension is at most `n`,
+    its barycenter vanishes along the axes above `n` and is at most 2
+    along the others. Each condition is a single bitmask test per
+    (type, position) pair.
+    """
+    low = (1 << (n + 1)) - 1
+    high = ((1 << k) - 1) & ~low
+    s = shape[:, None]
+    inside = ((dim[:, None] <= n)
+              & ((high & (~first | s)) == 0)
+              & ((low & ~(first | (second & ~s))) == 0))
+    return ~inside.reshape(-1)
+
+def CubicalSnHomology_graded_complex(n, k, length):
     X = CubicalComplex([length] * k)
+    dim, shape, first, second, _ = cubical_cell_masks(k, length)
+
+    # The predicate is closed under taking faces, so it coincides with the
+    # inclusion grading of its n-cells and can be passed directly.
+    grading = CubicalSnHomology_grading(n, k, dim, shape, first, second)
 
-    def grading(cell):
-        if X.cell_dim(cell) > n:
-            return 1
-        barycenter = X.barycenter(cell)
-        if barycenter[n+1:k] != [0] * (k - n - 1):
-            return 1
-        for d in range(n+1):
-            if barycenter[d] > 2:
-                return 1
-        return 0
-
-    include = set()
-    for cell in X(n):
-        if grading(cell) == 0: include.add(cell)
-    include_grading = inclusion_grading(X, include)
+    return GradedComplex(X, grading.astype(np.int64))
 
+# Graded complexes are immutable, so setup-only benchmarks share one
+# across the repetitions of a run instead of rebuilding it. Only the most
+# recent complex is kept, bounding the memory held by each worker.
+CubicalSnHomology_graded_complex_cached = functools.lru_cache(maxsize=1)(
+    CubicalSnHomology_graded_complex)
+graded_complex_caches.append(CubicalSnHomology_graded_complex_cached)
+
+def CubicalSnHomology_instantiate(n, k, length, cache=True, **kwargs):
     global gradX
-    gradX = GradedComplex(X, include_grading)
+    if cache:
+        gradX = CubicalSnHomology_graded_complex_cached(n, k, length)
+    else:
+        gradX = CubicalSnHomology_graded_complex(n, k, length)
 
 def CubicalSnHomology_run(n, k, truncate=False, limit=False, **kwargs):
     cm = ConnectionMatrix(gradX, match_dim = (n + 1 if limit else -1),
@@ -192,36 +288,68 @@ def CubicalSnHomology_run(n, k, truncate=False, limit=False, **kwargs):
     assert cm.count()[0] == result
 
 def CubicalSnHomology(n, k, length, truncate, limit, **kwargs):
-    CubicalSnHomology_instantiate(n, k, length)
+    CubicalSnHomology_instantiate(n, k, length, cache=False)
     CubicalSnHomology_run(n, k, truncate=truncate, limit=limit)
 
-def CubicalSnHomology_cells(n, k, length, limit, **kwargs):
-    X = CubicalComplex([length] * k)
+def cubical_cell_masks(k, length):
+    """
+    Computes per-cell data of `CubicalComplex([length] * k)` as bitmasks
+    over the `k` axes.
 
-    def grading(cell):
-        if X.cell_dim(cell) > n:
-            return 1
-        barycenter = X.barycenter(cell)
-        if barycenter[n+1:k] != [0] * (k - n - 1):
-            return 1
-        for d in range(n+1):
-            if barycenter[d] > 2:
-                return 1
-        return 0
+    Cells of a cubical complex are indexed by type first and position
+    second, `cell = type * length**k + position`. Types enumerate the
+    shapes sorted by dimension, and positions enumerate coordinates
+    with the first coordinate varying fastest.
 
-    total = 0
-    Sn = 0
-    for cell in X:
-        if limit:
-            if X.cell_dim(cell) > n + 1:
-                continue
-        if X.rightfringe(cell):
-            continue
-        if grading(cell) == 0:
-            Sn += 1
-        total += 1
-    return (Sn, total)
+    Returns
+    -------
+    dim: numpy.ndarray
+        Dimension of the cells of each type, shape (2**k,).
+    shape: numpy.ndarray
+        Shape of each type, bit `d` set when its cells extend along
+        axis `d`, shape (2**k,).
+    first, second, last: numpy.ndarray
+        For each position, bit `d` set when coordinate `d` is 0, 1 or
+        `length - 1` respectively, shape (length**k,).
+    """
+    shape = np.array(sorted(range(2 ** k), key=lambda s: bin(s).count("1")),
+                     dtype=np.int64)
+    dim = np.array([bin(s).count("1") for s in shape], dtype=np.int64)
+
+    position = np.arange(length ** k, dtype=np.int64)
+    first = np.zeros_like(position)
+    second = np.zeros_like(position)
+    last = np.zeros_like(position)
+    for d in range(k):
+        coord = (position // length ** d) % length
+        first |= (coord == 0).astype(np.int64) << d
+        second |= (coord == 1).astype(np.int64) << d
+        last |= (coord == length - 1).astype(np.int64) << d
+    return dim, shape, first, second, last
+
+# The Default and Dimension-Limited methods count the cells of the same
+# run one after the other, so only the most recent masks and grading are
+# kept for them to share; earlier runs are released.
+cubical_cell_masks_cached = functools.lru_cache(maxsize=1)(
+    cubical_cell_masks)
+
+@functools.lru_cache(maxsize=1)
+def CubicalSnHomology_grading_cached(n, k, length):
+    dim, shape, first, second, _ = cubical_cell_masks_cached(k, length)
+    return CubicalSnHomology_grading(n, k, dim, shape, first, second)
 
+def CubicalSnHomology_cells(n, k, length, limit, **kwargs):
+    dim, shape, _, _, last = cubical_cell_masks_cached(k, length)
+    grading = CubicalSnHomology_grading_cached(n, k, length)
+
+    # Right fringe cells extend along an axis where they sit at the end
+    counted = (shape[:, None] & last) == 0
+    if limit:
+        counted &= (dim <= n + 1)[:, None]
+    counted = counted.reshape(-1)
+    Sn = int(np.count_nonzero(counted & ~grading))
+    total = int(np.count_nonzero(counted))
+    return (Sn, total)
 
 k = 9
 length = 3
@@ -254,73 +382,88 @@ CubicalSnHomology_run_configs = {
     for n in range(1, k)
 }
 
-CubicalSnHomology_times = benchmark(
-    "Cubical Sn Homology",
-    iterations,
-    method_configs=CubicalSnHomology_method_configs,
-    run_configs=CubicalSnHomology_run_configs,
-    stmt_function=CubicalSnHomology,
-    verbose=verbose,
-    file=f
-)
-
-for method, times in CubicalSnHomology_times.items():
-    axs[0, 0].plot(range(1, len(times)+1), times, label = method)
-axs[0,0].set_title(f"Cubical Sn Homology (k={k}, l={length})")
-axs[0,0].set_ylabel("Runtime (seconds)")
-axs[0,0].set_xlabel("n")
-axs[0,0].set_xticks(range(1, k))
-axs[0,0].legend()
+if __name__ == "__main__":
+    CubicalSnHomology_times = benchmark(
+        "Cubical Sn Homology",
+        iterations,
+        method_configs=CubicalSnHomology_method_configs,
+        run_configs=CubicalSnHomology_run_configs,
+        stmt_function=CubicalSnHomology,
+        verbose=verbose,
+        file=f,
+        processes=processes
+    )
+
+    if plot_filename is not None:
+        for method, times in CubicalSnHomology_times.items():
+            axs[0, 0].plot(range(1, len(times)+1), times, label = method)
+        axs[0,0].set_title(f"Cubical Sn Homology (k={k}, l={length})")
+        axs[0,0].set_ylabel("Runtime (seconds)")
+        axs[0,0].set_xlabel("n")
+        axs[0,0].set_xticks(range(1, k))
+        axs[0,0].legend()
 
-"""
-Cubical Sn Homology (No Setup)
-------------------------------
-As above, but the timing only runs on the homology computation, not on
-the instantiation of the cubical complex.
-"""
+    """
+    Cubical Sn Homology (No Setup)
+    ------------------------------
+    As above, but the timing only runs on the homology computation, not on
+    the instantiation of the cubical complex. `ConnectionMatrix` reads the
+    graded complex directly, matching the cubical complex implicitly, so
+    no sparse boundary matrix is built inside the timed statement.
+    """
 
-CubicalSnHomologyNS_times = benchmark(
-    "Cubical Sn Homology (no setup)",
-    iterations,
-    method_configs=CubicalSnHomology_method_configs,
-    run_configs=CubicalSnHomology_run_configs,
-    stmt_function=CubicalSnHomology_run,
-    setup_function=CubicalSnHomology_instantiate,
-    verbose=verbose,
-    file=f
-)
-
-for method, times in CubicalSnHomologyNS_times.items():
-    axs[0,1].plot(range(1, len(times)+1), times, label = method)
-axs[0,1].set_title(f"Cubical Sn Homology (no setup, k={k}, l={length})")
-axs[0,1].set_ylabel("Runtime (seconds)")
-axs[0,1].set_xlabel("n")
-axs[0,1].set_xticks(range(1, k))
-axs[0,1].legend()
-
-
-# Calculate cell count and sparsity
-for method, method_config in CubicalSnHomology_method_configs.items():
-    if method in ("Truncated", "Dimension-Limited and Truncated"):
-        continue
-    Sn_cells = []
-    sparsity = []
-    for run, run_config in CubicalSnHomology_run_configs.items():
-        Sn, total = CubicalSnHomology_cells(**method_config, **run_config)
-        Sn_cells.append(Sn)
-        sparsity.append(100 * (1 - Sn/total))
-    axs[0,2].plot(range(1, k), Sn_cells, label=method)
-    axs[0,3].plot(range(1, k), sparsity, label=method)
-axs[0,2].set_title("Sn Cell Count")
-axs[0,3].set_title("Sn Sparsity")
-axs[0,2].set_ylabel("Cells")
-axs[0,3].set_ylabel("Sparsity (%)")
-axs[0,2].set_xlabel("n")
-axs[0,3].set_xlabel("n")
-axs[0,2].set_xticks(range(1,k))
-axs[0,3].set_xticks(range(1,k))
-axs[0,2].legend()
-axs[0,3].legend()
+    CubicalSnHomologyNS_times = benchmark(
+        "Cubical Sn Homology (no setup)",
+        iterations,
+        method_configs=CubicalSnHomology_method_configs,
+        run_configs=CubicalSnHomology_run_configs,
+        stmt_function=CubicalSnHomology_run,
+        setup_function=CubicalSnHomology_instantiate,
+        verbose=verbose,
+        file=f,
+        processes=processes
+    )
+
+    if plot_filename is not None:
+        for method, times in CubicalSnHomologyNS_times.items():
+            axs[0,1].plot(range(1, len(times)+1), times, label = method)
+        axs[0,1].set_title(f"Cubical Sn Homology (no setup, k={k}, l={length})")
+        axs[0,1].set_ylabel("Runtime (seconds)")
+        axs[0,1].set_xlabel("n")
+        axs[0,1].set_xticks(range(1, k))
+        axs[0,1].legend()
+
+
+    if plot_filename is not None:
+        # Calculate cell count and sparsity
+        methods = [method for method in CubicalSnHomology_method_configs
+                   if method not in ("Truncated",
+                                     "Dimension-Limited and Truncated")]
+        Sn_cells = {method: [] for method in methods}
+        sparsity = {method: [] for method in methods}
+        # Runs are the outer loop so the methods count each run's cells
+        # from the same cached grading before it is evicted
+        for run_config in CubicalSnHomology_run_configs.values():
+            for method in methods:
+                Sn, total = CubicalSnHomology_cells(
+                    **CubicalSnHomology_method_configs[method], **run_config)
+                Sn_cells[method].append(Sn)
+                sparsity[method].append(100 * (1 - Sn/total))
+        CubicalSnHomology_grading_cached.cache_clear()
+        cubical_cell_masks_cached.cache_clear()
+        for method in methods:
+            axs[0,2].plot(range(1, k), Sn_cells[method], label=method)
+            axs[0,3].plot(range(1, k), sparsity[method], label=method)
+        axs[0,2].set_title("Sn Cell Count")
+        axs[0,3].set_title("Sn Sparsity")
+        axs[0,2].set_ylabel("Cells")
+        axs[0,3].set_ylabel("Sparsity (%)")
+        axs[0,2].set_xlabel("n")
+        axs[0,3].set_xlabel("n")
+        axs[0,2].set_xticks(range(1,k))
+        axs[0,3].set_xticks(range(1,k))
+        axs[0,2].legend()
+        axs[0,3].legend()
 
 
 """
@@ -366,74 +509,87 @@ CubicalS1Homology_run_configs = {
     for dim in range(2, k_max)
 }
 
-CubicalS1Homology_times = benchmark(
-    "Cubical S1 Homology",
-    iterations,
-    method_configs=CubicalS1Homology_method_configs,
-    run_configs=CubicalS1Homology_run_configs,
-    stmt_function=CubicalSnHomology,
-    verbose=verbose,
-    file=f
-)
-
-for method, times in CubicalS1Homology_times.items():
-    axs[1,0].plot(range(2, len(times)+2), times, label = method)
-axs[1,0].set_title(f"Cubical S1 Homology (l={length})")
-axs[1,0].set_ylabel("Runtime (seconds)")
-axs[1,0].set_xlabel("k")
-axs[1,0].set_xticks(range(2, k_max))
-axs[1,0].legend()
+if __name__ == "__main__":
+    CubicalS1Homology_times = benchmark(
+        "Cubical S1 Homology",
+        iterations,
+        method_configs=CubicalS1Homology_method_configs,
+        run_configs=CubicalS1Homology_run_configs,
+        stmt_function=CubicalSnHomology,
+        verbose=verbose,
+        file=f,
+        processes=processes
+    )
+
+    if plot_filename is not None:
+        for method, times in CubicalS1Homology_times.items():
+            axs[1,0].plot(range(2, len(times)+2), times, label = method)
+        axs[1,0].set_title(f"Cubical S1 Homology (l={length})")
+        axs[1,0].set_ylabel("Runtime (seconds)")
+        axs[1,0].set_xlabel("k")
+        axs[1,0].set_xticks(range(2, k_max))
+        axs[1,0].legend()
 
 
-"""
-Cubical S1 Homology (No Setup)
-------------------------------
-As above, but the timing only runs on the homology computation, not on
-the instantiation of the cubical complex.
-"""
+    """
+    Cubical S1 Homology (No Setup)
+    ------------------------------
+    As above, but the timing only runs on the homology computation, not on
+    the instantiation of the cubical complex.
+    """
 
-CubicalS1HomologyNS_times = benchmark(
-    "Cubical S1 Homology (no setup)",
-    iterations,
-    method_configs=CubicalS1Homology_method_configs,
-    run_configs=CubicalS1Homology_run_configs,
-    stmt_function=CubicalSnHomology_run,
-    setup_function=CubicalSnHomology_instantiate,
-    verbose=verbose,
-    file=f
-)
-
-for method, times in CubicalS1HomologyNS_times.items():
-    axs[1,1].plot(range(2, len(times)+2), times, label = method)
-axs[1,1].set_title(f"Cubical S1 Homology (no setup, l={length})")
-axs[1,1].set_ylabel("Runtime (seconds)")
-axs[1,1].set_xlabel("k")
-axs[1,1].set_xticks(range(2, k_max))
-axs[1,1].legend()
-
-
-# Calculate cell count and sparsity
-for method, method_config in CubicalS1Homology_method_configs.items():
-    if method in ("Truncated", "Dimension-Limited and Truncated"):
-        continue
-    S1_cells = []
-    sparsity = []
-    for run, run_config in CubicalS1Homology_run_configs.items():
-        Sn, total = CubicalSnHomology_cells(**method_config, **run_config)
-        S1_cells.append(Sn)
-        sparsity.append(100 * (1 - Sn/total))
-    axs[1,2].plot(range(2, k_max), S1_cells, label=method)
-    axs[1,3].plot(range(2, k_max), sparsity, label=method)
-axs[1,2].set_title("S1 Cell Count")
-axs[1,3].set_title("S1 Sparsity")
-axs[1,2].set_ylabel("Cells")
-axs[1,3].set_ylabel("Sparsity (%)")
-axs[1,2].set_xlabel("k")
-axs[1,3].set_xlabel("k")
-axs[1,2].set_xticks(range(2,k_max))
-axs[1,3].set_xticks(range(2,k_max))
-axs[1,2].legend()
-axs[1,3].legend()
+    CubicalS1HomologyNS_times = benchmark(
+        "Cubical S1 Homology (no setup)",
+        iterations,
+        method_configs=CubicalS1Homology_method_configs,
+        run_configs=CubicalS1Homology_run_configs,
+        stmt_function=CubicalSnHomology_run,
+        setup_function=CubicalSnHomology_instantiate,
+        verbose=verbose,
+        file=f,
+        processes=processes
+    )
+
+    if plot_filename is not None:
+        for method, times in CubicalS1HomologyNS_times.items():
+            axs[1,1].plot(range(2, len(times)+2), times, label = method)
+        axs[1,1].set_title(f"Cubical S1 Homology (no setup, l={length})")
+        axs[1,1].set_ylabel("Runtime (seconds)")
+        axs[1,1].set_xlabel("k")
+        axs[1,1].set_xticks(range(2, k_max))
+        axs[1,1].legend()
+
+
+    if plot_filename is not None:
+        # Calculate cell count and sparsity
+        methods = [method for method in CubicalS1Homology_method_configs
+                   if method not in ("Truncated",
+                                     "Dimension-Limited and Truncated")]
+        S1_cells = {method: [] for method in methods}
+        sparsity = {method: [] for method in methods}
+        # Runs are the outer loop so the methods count each run's cells
+        # from the same cached grading before it is evicted
+        for run_config in CubicalS1Homology_run_configs.values():
+            for method in methods:
+                Sn, total = CubicalSnHomology_cells(
+                    **CubicalS1Homology_method_configs[method], **run_config)
+                S1_cells[method].append(Sn)
+                sparsity[method].append(100 * (1 - Sn/total))
+        CubicalSnHomology_grading_cached.cache_clear()
+        cubical_cell_masks_cached.cache_clear()
+        for method in methods:
+            axs[1,2].plot(range(2, k_max), S1_cells[method], label=method)
+            axs[1,3].plot(range(2, k_max), sparsity[method], label=method)
+        axs[1,2].set_title("S1 Cell Count")
+        axs[1,3].set_title("S1 Sparsity")
+        axs[1,2].set_ylabel("Cells")
+        axs[1,3].set_ylabel("Sparsity (%)")
+        axs[1,2].set_xlabel("k")
+        axs[1,3].set_xlabel("k")
+        axs[1,2].set_xticks(range(2,k_max))
+        axs[1,3].set_xticks(range(2,k_max))
+        axs[1,2].legend()
+        axs[1,3].legend()
 
 
 """
@@ -449,20 +605,27 @@ made up of top-dimensional cells except the one at coordinates
 (1, 1, ..., 1).
 """
 
-def FullCubicalS1Homology_instantiate(k, length, **kwargs):
+def FullCubicalS1Homology_graded_complex(k, length):
     X = CubicalComplex([length] * k)
 
-    def top_grading(cell):
-        if X.coordinates(cell)[2:k] != [0] * (k - 2):
-            return 1
-        if X.coordinates(cell)[0:2] == [1, 1]:
-            return 1
-        return 0
+    coords = X.top_coordinates_array()
+    top_values = (np.any(coords[:, 2:] != 0, axis=1)
+                  | np.all(coords[:, :2] == 1, axis=1))
+
+    grading = construct_grading(X, top_values.astype(np.int64))
+
+    return GradedComplex(X, grading)
 
-    grading = construct_grading(X, top_grading)
+FullCubicalS1Homology_graded_complex_cached = functools.lru_cache(maxsize=1)(
+    FullCubicalS1Homology_graded_complex)
+graded_complex_caches.append(FullCubicalS1Homology_graded_complex_cached)
 
+def FullCubicalS1Homology_instantiate(k, length, cache=True, **kwargs):
     global gradX
-    gradX = GradedComplex(X, grading)
+    if cache:
+        gradX = FullCubicalS1Homology_graded_complex_cached(k, length)
+    else:
+        gradX = FullCubicalS1Homology_graded_complex(k, length)
 
 def FullCubicalS1Homology_run(k, truncate=False, **kwargs):
     cm = ConnectionMatrix(gradX, truncate=truncate, max_grade=0, verbose=progress)
@@ -472,18 +635,14 @@ def FullCubicalS1Homology_run(k, truncate=False, **kwargs):
     assert cm.count()[0] == result
 
 def FullCubicalS1Homology(k, length, truncate, **kwargs):
-    FullCubicalS1Homology_instantiate(k, length)
+    FullCubicalS1Homology_instantiate(k, length, cache=False)
     FullCubicalS1Homology_run(k, truncate=truncate)
 
 def FullCubicalS1Homology_cells(k, length, **kwargs):
     X = CubicalComplex([length] * k)
 
-    def top_grading(cell):
-        if X.coordinates(cell) == [1] * k:
-            return 1
-        return 0
-
-    grading = construct_grading(X, top_grading)
+    top_values = np.all(X.top_coordinates_array() == 1, axis=1)
+    grading = construct_grading(X, top_values.astype(np.int64))
 
     total = 0
     S1_cells = 0
@@ -514,79 +673,86 @@ FullCubicalS1Homology_run_configs = {
     for dim in range(2, k_max)
 }
 
-FullCubicalS1Homology_times = benchmark(
-    "Cubical Top S1 Homology",
-    iterations,
-    method_configs=FullCubicalS1Homology_method_configs,
-    run_configs=FullCubicalS1Homology_run_configs,
-    stmt_function=FullCubicalS1Homology,
-    verbose=verbose,
-    file=f
-)
-
-for method, times in FullCubicalS1Homology_times.items():
-    axs[2,0].plot(range(2, len(times)+2), times, label = method)
-axs[2,0].set_title(f"Cubical Top S1 Homology (l={length})")
-axs[2,0].set_ylabel("Runtime (seconds)")
-axs[2,0].set_xlabel("k")
-axs[2,0].set_xticks(range(2, k_max))
-axs[2,0].legend()
+if __name__ == "__main__":
+    FullCubicalS1Homology_times = benchmark(
+        "Cubical Top S1 Homology",
+        iterations,
+        method_configs=FullCubicalS1Homology_method_configs,
+        run_configs=FullCubicalS1Homology_run_configs,
+        stmt_function=FullCubicalS1Homology,
+        verbose=verbose,
+        file=f,
+        processes=processes
+    )
+
+    if plot_filename is not None:
+        for method, times in FullCubicalS1Homology_times.items():
+            axs[2,0].plot(range(2, len(times)+2), times, label = method)
+        axs[2,0].set_title(f"Cubical Top S1 Homology (l={length})")
+        axs[2,0].set_ylabel("Runtime (seconds)")
+        axs[2,0].set_xlabel("k")
+        axs[2,0].set_xticks(range(2, k_max))
+        axs[2,0].legend()
 
 
-"""
-Cubical Top S1 Homology (No Setup)
-------------------------------
-As above, but the timing only runs on the homology computation, not on
-the instantiation of the cubical complex.
-"""
+    """
+    Cubical Top S1 Homology (No Setup)
+    ------------------------------
+    As above, but the timing only runs on the homology computation, not on
+    the instantiation of the cubical complex.
+    """
 
-FullCubicalS1HomologyNS_times = benchmark(
-    "Cubical Top S1 Homology (no setup)",
-    iterations,
-    method_configs=FullCubicalS1Homology_method_configs,
-    run_configs=FullCubicalS1Homology_run_configs,
-    stmt_function=FullCubicalS1Homology_run,
-    setup_function=FullCubicalS1Homology_instantiate,
-    verbose=verbose,
-    file=f
-)
-
-for method, times in FullCubicalS1HomologyNS_times.items():
-    axs[2,1].plot(range(2, len(times)+2), times, label = method)
-axs[2,1].set_title(f"Cubical Top S1 Homology (no setup, l={length})")
-axs[2,1].set_ylabel("Runtime (seconds)")
-axs[2,1].set_xlabel("k")
-axs[2,1].set_xticks(range(2, k_max))
-axs[2,1].legend()
-
-
-# Calculate cell count and sparsity
-for method, method_config in FullCubicalS1Homology_method_configs.items():
-    if method in ("Truncated",): continue
-    S1_cells = []
-    sparsity = []
-    for run, run_config in FullCubicalS1Homology_run_configs.items():
-        Sn, total = FullCubicalS1Homology_cells(**method_config, **run_config)
-        S1_cells.append(Sn)
-        sparsity.append(100 * (1 - Sn/total))
-    axs[2,2].plot(range(2, k_max), S1_cells, label=method)
-    axs[2,3].plot(range(2, k_max), sparsity, label=method)
-axs[2,2].set_title("Top S1 Cell Count")
-axs[2,3].set_title("Top S1 Sparsity")
-axs[2,2].set_ylabel("Cells")
-axs[2,3].set_ylabel("Sparsity (%)")
-axs[2,2].set_xlabel("k")
-axs[2,3].set_xlabel("k")
-axs[2,2].set_xticks(range(2,k_max))
-axs[2,3].set_xticks(range(2,k_max))
-axs[2,2].legend()
-axs[2,3].legend()
-
-
-# Save plots
-if plot_filename is not None:
-    os.makedirs("examples/plots", exist_ok=True)
-    fig.savefig(f"examples/plots/{plot_filename}")
-
-if f is not None:
-    f.close()
+    FullCubicalS1HomologyNS_times = benchmark(
+        "Cubical Top S1 Homology (no setup)",
+        iterations,
+        method_configs=FullCubicalS1Homology_method_configs,
+        run_configs=FullCubicalS1Homology_run_configs,
+        stmt_function=FullCubicalS1Homology_run,
+        setup_function=FullCubicalS1Homology_instantiate,
+        verbose=verbose,
+        file=f,
+        processes=processes
+    )
+
+    if plot_filename is not None:
+        for method, times in FullCubicalS1HomologyNS_times.items():
+            axs[2,1].plot(range(2, len(times)+2), times, label = method)
+        axs[2,1].set_title(f"Cubical Top S1 Homology (no setup, l={length})")
+        axs[2,1].set_ylabel("Runtime (seconds)")
+        axs[2,1].set_xlabel("k")
+        axs[2,1].set_xticks(range(2, k_max))
+        axs[2,1].legend()
+
+
+    if plot_filename is not None:
+        # Calculate cell count and sparsity
+        for method, method_config in FullCubicalS1Homology_method_configs.items():
+            if method in ("Truncated",): continue
+            S1_cells = []
+            sparsity = []
+            for run, run_config in FullCubicalS1Homology_run_configs.items():
+                Sn, total = FullCubicalS1Homology_cells(**method_config, **run_config)
+                S1_cells.append(Sn)
+                sparsity.append(100 * (1 - Sn/total))
+            axs[2,2].plot(range(2, k_max), S1_cells, label=method)
+            axs[2,3].plot(range(2, k_max), sparsity, label=method)
+        axs[2,2].set_title("Top S1 Cell Count")
+        axs[2,3].set_title("Top S1 Sparsity")
+        axs[2,2].set_ylabel("Cells")
+        axs[2,3].set_ylabel("Sparsity (%)")
+        axs[2,2].set_xlabel("k")
+        axs[2,3].set_xlabel("k")
+        axs[2,2].set_xticks(range(2,k_max))
+        axs[2,3].set_xticks(range(2,k_max))
+        axs[2,2].legend()
+        axs[2,3].legend()
+
+
+if __name__ == "__main__":
+    # Save plots
+    if plot_filename is not None:
+        os.makedirs("examples/plots", exist_ok=True)
+        fig.savefig(f"examples/plots/{plot_filename}")
+
+    if f is not None:
+        f.close()
@@ -18,13 +18,14 @@ def CubicalHomology(cubes):
     C = CubicalComplex(grid_size_ext)
     # Shape of top dimensional cells
     shape = 2**dim - 1
-    # Get cells indices in the complex
-    cells_indices = [C.cell_index(cube, shape) for cube in cubes]
+    # Get cells indices in the complex (as a set, since the grading
+    # below tests membership for every cell in the complex)
+    cells_indices = set(C.cell_index(cube, shape) for cube in cubes)
     # Assign grading 0 to cells in the list of cubes
     def grading(cell):
-        if any(c in cells_indices for c in C.topstar(cell)):
-            return 0
-        return 1
+        if cells_indices.isdisjoint(C.topstar(cell)):
+            return 1
+        return 0
     # Create a pyCHomP graded complex
     graded_complex = GradedComplex(C, grading)
     # Compute the connection matrix
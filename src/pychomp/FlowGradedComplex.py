@@ -4,6 +4,8 @@
 # Marcio Gameiro
 # 2021-03-24
 
+import numpy as np
+
 from pychomp._chomp import *
 from pychomp.CondensationGraph import *
 from pychomp.StronglyConnectedComponents import *
@@ -38,18 +40,14 @@ def FlowGradedComplex(complex, discrete_flow):
   #             extension of the poset, we assign each cell to 
   #             the minimum indexed poset which contains a top cell
   #             it is incident.
-
-
-  # for cell in reversed(range(0,len(complex))):
-  #   current_value = mapping[cell]
-  #   for bd_cell in complex.boundary({cell}):
-  #     mapping[bd_cell] = min(mapping.get(bd_cell,current_value), current_value)
-
-  #num_nontop_cells = complex.size() - complex.size(complex.dimension())
-
-  #valuation = lambda x : min([mapping[z] for z in complex.star(x) if z >= num_nontop_cells])
-
-  grading = construct_grading(complex, lambda x : mapping[x] );
+  #             construct_grading does this in C++ by visiting top
+  #             cells in increasing value and walking the closure of
+  #             each, so every cell is assigned once, on first reach.
+
+  # The top cells are exactly `vertices`, in order, so the mapping is
+  # passed as a dense array rather than a callback into the dict.
+  top_values = np.array([ mapping[v] for v in vertices ], dtype=np.int64)
+  grading = construct_grading(complex, top_values)
   return dag, GradedComplex(complex, grading) # lambda x : mapping[x])
 
   #return poset, chompy.GradedComplex(complex, lambda x : mapping[x])
@@ -0,0 +1,36 @@
+# MorseGradedComplex.py
+# MIT LICENSE
+
+from functools import lru_cache
+
+from pychomp._chomp import *
+from pychomp._chomp import MorseGradedComplex as _MorseGradedComplex
+
+@lru_cache(maxsize=64)
+def _cached_morse_graded_complex(base, match_dim, truncate, max_grade):
+    return _MorseGradedComplex(base, match_dim=match_dim, truncate=truncate,
+                               max_grade=max_grade)
+
+def MorseGradedComplex(base, match_dim=-1, truncate=False, max_grade=0,
+                       verbose=False):
+    """Return the Morse reduction of the graded complex `base`.
+
+    Results are cached on (base, match_dim, truncate, max_grade), so
+    repeated reductions of the same graded complex return the same
+    object. This relies on graded complexes being immutable once
+    constructed; the cache holds a reference to `base`, so its identity
+    is never reused while the entry lives. Use
+    MorseGradedComplex.clear_cache() to release the cached complexes.
+
+    A MorseMatching may be passed in place of `match_dim` to reduce along
+    that matching; such calls, and verbose ones, are not cached.
+    """
+    if isinstance(match_dim, MorseMatching):
+        return _MorseGradedComplex(base, match_dim)
+    if verbose:
+        return _MorseGradedComplex(base, match_dim=match_dim,
+                                   truncate=truncate, max_grade=max_grade,
+                                   verbose=verbose)
+    return _cached_morse_graded_complex(base, match_dim, truncate, max_grade)
+
+MorseGradedComplex.clear_cache = _cached_morse_graded_complex.cache_clear
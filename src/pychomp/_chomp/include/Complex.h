@@ -5,6 +5,8 @@
 
 #pragma once
 
+#include <stdexcept>
+
 #include "common.h"
 
 #include "Integer.h"
@@ -22,55 +24,37 @@ public:
   /// boundary
   virtual Chain
   boundary ( Chain const& chain ) const {
-    Chain result;
-    auto callback = [&](Integer bd_cell){result += bd_cell;};
+    // Scratch space reused across calls on this thread (see sweep_)
+    static thread_local std::vector<Integer> entries;
+    entries.clear();
+    auto callback = [&](Integer bd_cell){entries.push_back(bd_cell);};
     for ( auto x : chain ) column(x, callback);
-    return result;
+    reduce_(entries, 0);
+    return Chain(entries.begin(), entries.end());
   }
 
   /// coboundary
   virtual Chain
   coboundary ( Chain const& chain ) const {
-    Chain result;
-    auto callback = [&](Integer bd_cell){result += bd_cell;};
+    // Scratch space reused across calls on this thread (see sweep_)
+    static thread_local std::vector<Integer> entries;
+    entries.clear();
+    auto callback = [&](Integer bd_cell){entries.push_back(bd_cell);};
     for ( auto x : chain ) row(x, callback);
-    return result;  
+    reduce_(entries, 0);
+    return Chain(entries.begin(), entries.end());
   }
 
   /// closure
   virtual std::unordered_set<Integer>
   closure ( std::unordered_set<Integer> cells ) const {
-    std::unordered_set<Integer> result;
-    std::stack<Integer> work_stack;
-    for ( auto cell : cells) work_stack.push(cell);
-    while ( not work_stack.empty() ) {
-      auto v = work_stack.top();
-      work_stack.pop();
-      if ( result.count(v) ) continue;
-      result.insert(v);
-      for ( auto u : boundary({v}) ) {
-        work_stack.push(u);
-      }
-    }
-    return result;
+    return sweep_(cells, &Complex::column);
   }
 
   /// star
   virtual std::unordered_set<Integer>
   star ( std::unordered_set<Integer> cells ) const {
-    std::unordered_set<Integer> result;
-    std::stack<Integer> work_stack;
-    for ( auto cell : cells) work_stack.push(cell);
-    while ( not work_stack.empty() ) {
-      auto v = work_stack.top();
-      work_stack.pop();
-      if ( result.count(v) ) continue;
-      result.insert(v);
-      for ( auto u : coboundary({v}) ) {
-        work_stack.push(u);
-      }
-    }
-    return result;
+    return sweep_(cells, &Complex::row);
   }
 
   /// topstar
@@ -85,6 +69,46 @@ public:
     return result;
   }
 
+  /// boundary_csr
+  ///   Return the boundary matrix in compressed form (indptr, indices),
+  ///   where the boundary of cell i is indices[indptr[i]:indptr[i+1]]
+  std::pair<std::vector<Integer>, std::vector<Integer>>
+  boundary_csr ( void ) const {
+    std::vector<Integer> cells ( size() );
+    std::iota(cells.begin(), cells.end(), 0);
+    return boundary_batch(cells);
+  }
+
+  /// boundary_batch
+  ///   Return the boundaries of `cells` in compressed form (indptr, indices),
+  ///   where the boundary of cells[i] is indices[indptr[i]:indptr[i+1]]
+  std::pair<std::vector<Integer>, std::vector<Integer>>
+  boundary_batch ( std::vector<Integer> const& cells ) const {
+    return batch_(cells, &Complex::column);
+  }
+
+  /// coboundary_batch
+  ///   Return the coboundaries of `cells` in compressed form (indptr, indices),
+  ///   where the coboundary of cells[i] is indices[indptr[i]:indptr[i+1]]
+  std::pair<std::vector<Integer>, std::vector<Integer>>
+  coboundary_batch ( std::vector<Integer> const& cells ) const {
+    return batch_(cells, &Complex::row);
+  }
+
+  /// boundary_sorted
+  ///   Return the boundary of the chain `cells` as a sorted vector
+  std::vector<Integer>
+  boundary_sorted ( std::vector<Integer> const& cells ) const {
+    return sorted_(cells, &Complex::column);
+  }
+
+  /// coboundary_sorted
+  ///   Return the coboundary of the chain `cells` as a sorted vector
+  std::vector<Integer>
+  coboundary_sorted ( std::vector<Integer> const& cells ) const {
+    return sorted_(cells, &Complex::row);
+  }
+
   /// column
   ///   Apply "callback" method to every element in ith column of
   ///   boundary matrix
@@ -144,6 +168,99 @@ public:
   }
 
 protected:
+  /// reduce_
+  ///   Sort the entries of `v` from position `begin` on and reduce them
+  ///   with Z_2 coefficients, i.e. remove entries occurring an even
+  ///   number of times
+  static void
+  reduce_ ( std::vector<Integer> & v, Integer begin ) {
+    std::sort(v.begin() + begin, v.end());
+    auto out = v.begin() + begin;
+    for ( auto it = out; it != v.end(); ) {
+      auto next = std::find_if(it, v.end(), [&](Integer x){return x != *it;});
+      if ( (next - it) % 2 ) * out ++ = * it;
+      it = next;
+    }
+    v.erase(out, v.end());
+  }
+
+  /// Visit
+  ///   Pointer to column or row
+  typedef void (Complex::*Visit)(Integer, std::function<void(Integer)> const&) const;
+
+  /// sweep_
+  ///   Return all cells reachable from `cells` by repeatedly applying
+  ///   `visit` (column for closure, row for star), where each step is
+  ///   reduced with Z_2 coefficients as in boundary and coboundary
+  std::unordered_set<Integer>
+  sweep_ ( std::unordered_set<Integer> const& cells, Visit visit ) const {
+    // Visited cells are marked in a bitmap shared by all calls on this
+    // thread. Only the bits of reached cells are cleared afterwards, so a
+    // call costs time proportional to its result rather than to size().
+    // The work stack and the other scratch vectors are likewise kept per
+    // thread so their capacity is reused. This is safe as long as `visit`
+    // never calls back into closure or star, which no column or row does.
+    static thread_local std::vector<uint64_t> visited;
+    if ( visited.size() * 64 < (uint64_t) size() ) visited.resize((size() + 63) / 64, 0);
+    static thread_local std::vector<Integer> reached;
+    static thread_local std::vector<Integer> work_stack;
+    static thread_local std::vector<Integer> entries;
+    reached.clear();
+    struct Reset {
+      std::vector<uint64_t> & bits;
+      std::vector<Integer> const& cells;
+      ~Reset ( void ) { for ( auto x : cells ) bits[x >> 6] &= ~(1ULL << (x & 63)); }
+    } reset { visited, reached };
+
+    for ( auto x : cells ) {
+      if ( x < 0 || x >= size() ) throw std::out_of_range("cell out of range");
+    }
+    work_stack.assign(cells.begin(), cells.end());
+    std::function<void(Integer)> callback = [&](Integer y){entries.push_back(y);};
+    while ( not work_stack.empty() ) {
+      auto v = work_stack.back();
+      work_stack.pop_back();
+      uint64_t bit = 1ULL << (v & 63);
+      if ( visited[v >> 6] & bit ) continue;
+      visited[v >> 6] |= bit;
+      reached.push_back(v);
+      entries.clear();
+      (this->*visit)(v, callback);
+      reduce_(entries, 0);
+      work_stack.insert(work_stack.end(), entries.begin(), entries.end());
+    }
+    return std::unordered_set<Integer>(reached.begin(), reached.end());
+  }
+
+  /// sorted_
+  ///   Sum of the entries `visit` (column or row) produces for each of
+  ///   `cells`, reduced with Z_2 coefficients and sorted
+  std::vector<Integer>
+  sorted_ ( std::vector<Integer> const& cells, Visit visit ) const {
+    std::vector<Integer> entries;
+    std::function<void(Integer)> callback = [&](Integer y){entries.push_back(y);};
+    for ( auto x : cells ) (this->*visit)(x, callback);
+    reduce_(entries, 0);
+    return entries;
+  }
+
+  /// batch_
+  ///   Collect the entries `visit` (column or row) produces for each of
+  ///   `cells`, reduced with Z_2 coefficients, in compressed form
+  std::pair<std::vector<Integer>, std::vector<Integer>>
+  batch_ ( std::vector<Integer> const& cells, Visit visit ) const {
+    std::vector<Integer> indptr ( 1, 0 );
+    std::vector<Integer> indices;
+    indptr.reserve(cells.size() + 1);
+    std::function<void(Integer)> callback = [&](Integer y){indices.push_back(y);};
+    for ( auto x : cells ) {
+      (this->*visit)(x, callback);
+      reduce_(indices, indptr.back());
+      indptr.push_back(indices.size());
+    }
+    return {indptr, indices};
+  }
+
   Integer dim_;
   std::vector<Iterator> begin_; // begin_by_dim_[D+1] == size_;
 };
@@ -152,6 +269,7 @@ protected:
 
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include "NumpyArray.h"
 namespace py = pybind11;
 
 inline void
@@ -162,9 +280,57 @@ ComplexBinding(py::module &m) {
     .def("coboundary", &Complex::coboundary)
     .def("column", &Complex::column)
     .def("row", &Complex::row)
-    .def("closure", &Complex::closure)    
+    .def("closure", &Complex::closure)
+    .def("closure", [](Complex const& c, CellArray cells) {
+       auto v = as_vector(cells);
+       return c.closure(std::unordered_set<Integer>(v.begin(), v.end()));
+    })
     .def("star", &Complex::star)
+    .def("star", [](Complex const& c, CellArray cells) {
+       auto v = as_vector(cells);
+       return c.star(std::unordered_set<Integer>(v.begin(), v.end()));
+    })
     .def("topstar", &Complex::topstar)
+    .def("boundary_csr", [](Complex const& c) {
+       auto csr = c.boundary_csr();
+       return py::make_tuple(as_array(std::move(csr.first)),
+                             as_array(std::move(csr.second)));
+    })
+    .def("boundary_batch", [](Complex const& c, CellArray cells) {
+       auto csr = c.boundary_batch(as_vector(cells));
+       return py::make_tuple(as_array(std::move(csr.first)),
+                             as_array(std::move(csr.second)));
+    })
+    .def("coboundary_batch", [](Complex const& c, CellArray cells) {
+       auto csr = c.coboundary_batch(as_vector(cells));
+       return py::make_tuple(as_array(std::move(csr.first)),
+                             as_array(std::move(csr.second)));
+    })
+    .def("boundary_sorted", [](Complex const& c, Integer cell) {
+       return as_array(c.boundary_sorted({cell}));
+    })
+    .def("boundary_sorted", [](Complex const& c, CellArray cells) {
+       return as_array(c.boundary_sorted(as_vector(cells)));
+    })
+    .def("coboundary_sorted", [](Complex const& c, Integer cell) {
+       return as_array(c.coboundary_sorted({cell}));
+    })
+    .def("coboundary_sorted", [](Complex const& c, CellArray cells) {
+       return as_array(c.coboundary_sorted(as_vector(cells)));
+    })
+    .def("cells", [](Complex const& c) {
+       std::vector<Integer> cells ( c.size() );
+       std::iota(cells.begin(), cells.end(), 0);
+       return as_array(std::move(cells));
+    })
+    .def("cells_of_dim", [](Complex const& c, Integer d) {
+       if ( d < 0 || d > c.dimension() ) {
+         throw std::invalid_argument("Dimension out of range");
+       }
+       std::vector<Integer> cells ( c.size(d) );
+       std::iota(cells.begin(), cells.end(), *c(d).begin());
+       return as_array(std::move(cells));
+    })
     .def("__iter__", [](Complex const& v) {
        return py::make_iterator(v.begin(), v.end());
     }, py::keep_alive<0, 1>())
@@ -33,15 +33,19 @@ public:
   ///   Note: The cubical complex does not have cells on the 
   ///         far right, so to have a "full" cubical 
   ///         complex as a subcomplex, pad with an extra box.
-  CubicalComplex ( std::vector<Integer> const& boxes ) {
-    assign ( boxes );
+  ///   Setting `precompute_coboundary` stores the coboundary of every
+  ///   cell in a table, trading memory for faster row queries.
+  CubicalComplex ( std::vector<Integer> const& boxes,
+                   bool precompute_coboundary = false ) {
+    assign ( boxes, precompute_coboundary );
   }
 
   /// assign
   ///   Initialize the complex that is boxes[i] boxes across 
   ///   in dimensions d = 0, 1, ..., boxes.size() - 1
   void
-  assign ( std::vector<Integer> const& boxes ) {
+  assign ( std::vector<Integer> const& boxes,
+           bool precompute_coboundary = false ) {
     // Get dimension
     Integer D = boxes.size();
 
@@ -75,6 +79,10 @@ public:
     std::stable_sort(ST.begin(), ST.end(), compare);
     for ( Integer type = 0; type < M; ++ type) TS[ST[type]] = type; 
 
+    // Tabulate the dimension of each type, so cell_dim is a lookup
+    dim_from_type_.resize ( M );
+    for ( Integer type = 0; type < M; ++ type) dim_from_type_[type] = popcount_(ST[type]);
+
     // Set up iterator bounds for every dimension
     begin_ . resize ( dimension() + 2, N );
     for ( Integer type = 0, idx = 0; type < M; ++ type, idx += L ) {
@@ -93,6 +101,20 @@ public:
         }
       }
     }
+
+    // Set up coboundary table, if requested
+    cbd_indptr_.clear();
+    cbd_indices_.clear();
+    if ( precompute_coboundary ) {
+      cbd_indptr_.reserve(N + 1);
+      cbd_indptr_.push_back(0);
+      for ( Integer cell = 0; cell < N; ++ cell ) {
+        cbd_indptr_.push_back(cbd_indptr_.back() + 2 * (D - cell_dim(cell)));
+      }
+      cbd_indices_.reserve(cbd_indptr_.back());
+      auto callback = [&](Integer cbd_cell){cbd_indices_.push_back(cbd_cell);};
+      for ( Integer cell = 0; cell < N; ++ cell ) row_(cell, callback);
+    }
   }
 
   /// column
@@ -116,17 +138,13 @@ public:
   /// row
   virtual void
   row ( Integer cell, std::function<void(Integer)> const& callback ) const final {
-    Integer shape = cell_shape(cell);
-    Integer position = cell % type_size();
-    for ( Integer d = 0, bit = 1; d < dimension(); ++ d, bit <<= 1L ) {
-      // If cell has extent in this dimension, no coboundaries.
-      if ( shape & bit ) continue;
-      Integer type_offset = type_size() * ( TS() [ shape ^ bit ] );
-      callback( position + type_offset );
-      Integer left_position = position - PV()[d];
-      if (left_position < 0) left_position += type_size();
-      callback( left_position + type_offset );
+    if ( not cbd_indptr_.empty() ) {
+      for ( Integer i = cbd_indptr_[cell]; i < cbd_indptr_[cell+1]; ++ i ) {
+        callback(cbd_indices_[i]);
+      }
+      return;
     }
+    row_(cell, callback);
   }
 
   /// topstar
@@ -364,7 +382,7 @@ public:
   ///   Return dimension of cell
   Integer
   cell_dim ( Integer cell ) const {
-    return popcount_(cell_shape(cell));
+    return dim_from_type_[cell_type(cell)];
   }
 
   /// operator ==
@@ -424,6 +442,24 @@ public:
 
 private:
 
+  /// row_
+  ///   Enumerate the coboundary of a cell from its shape and position
+  template < typename Callback >
+  void
+  row_ ( Integer cell, Callback const& callback ) const {
+    Integer shape = cell_shape(cell);
+    Integer position = cell % type_size();
+    for ( Integer d = 0, bit = 1; d < dimension(); ++ d, bit <<= 1L ) {
+      // If cell has extent in this dimension, no coboundaries.
+      if ( shape & bit ) continue;
+      Integer type_offset = type_size() * ( TS() [ shape ^ bit ] );
+      callback( position + type_offset );
+      Integer left_position = position - PV()[d];
+      if (left_position < 0) left_position += type_size();
+      callback( left_position + type_offset );
+    }
+  }
+
   Integer
   popcount_ ( Integer x ) const {
     // http://lemire.me/blog/2016/05/23/the-surprising-cleverness-of-modern-compilers/
@@ -436,9 +472,12 @@ private:
   std::vector<Integer> place_values_;
   std::vector<Integer> shape_from_type_;
   std::vector<Integer> type_from_shape_;
+  std::vector<Integer> dim_from_type_;
   std::vector<Integer> topstar_offset_;
   Integer num_types_;
   Integer type_size_;
+  std::vector<Integer> cbd_indptr_;
+  std::vector<Integer> cbd_indices_;
 };
 
 /// std::hash<CubicalComplex>
@@ -460,15 +499,18 @@ namespace std {
 
 /// Python Bindings
 
+#include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include "NumpyArray.h"
 namespace py = pybind11;
 
 inline void
 CubicalComplexBinding(py::module &m) {
   py::class_<CubicalComplex, std::shared_ptr<CubicalComplex>, Complex>(m, "CubicalComplex")
     .def(py::init<>())
-    .def(py::init<std::vector<Integer> const&>())
+    .def(py::init<std::vector<Integer> const&, bool>(),
+         py::arg("boxes"), py::arg("precompute_coboundary") = false)
     .def("boxes", &CubicalComplex::boxes)
     .def("coordinates", &CubicalComplex::coordinates)
     .def("barycenter", &CubicalComplex::barycenter)    
@@ -483,5 +525,73 @@ CubicalComplexBinding(py::module &m) {
     .def("rightfringe", &CubicalComplex::rightfringe)
     .def("mincoords", &CubicalComplex::mincoords)
     .def("maxcoords", &CubicalComplex::maxcoords)
-    .def("parallelneighbors", &CubicalComplex::parallelneighbors);
+    .def("parallelneighbors", &CubicalComplex::parallelneighbors)
+    .def("barycenters_array", [](CubicalComplex const& c) {
+       // Barycenters of all cells as an (N, D) array. Positions are walked
+       // with an odometer over the coordinates instead of dividing per cell.
+       Integer D = c.dimension();
+       py::array_t<int32_t> result({c.size(), D});
+       auto out = result.mutable_unchecked<2>();
+       std::vector<int32_t> coordinates(D);
+       for ( Integer type = 0, cell = 0; type < (1L << D); ++ type ) {
+         Integer shape = c.ST()[type];
+         std::fill(coordinates.begin(), coordinates.end(), 0);
+         for ( Integer pos = 0; pos < c.type_size(); ++ pos, ++ cell ) {
+           for ( Integer d = 0; d < D; ++ d ) {
+             out(cell, d) = 2 * coordinates[d] + ((shape >> d) & 1);
+           }
+           for ( Integer d = 0; d < D; ++ d ) {
+             if ( ++ coordinates[d] < c.boxes()[d] ) break;
+             coordinates[d] = 0;
+           }
+         }
+       }
+       return result;
+    })
+    .def("top_coordinates_array", [](CubicalComplex const& c) {
+       // Coordinates of the top cells as an (M, D) array, in the order
+       // of their cell indices, walked with an odometer as above.
+       Integer D = c.dimension();
+       py::array_t<int32_t> result({c.type_size(), D});
+       auto out = result.mutable_unchecked<2>();
+       std::vector<int32_t> coordinates(D, 0);
+       for ( Integer pos = 0; pos < c.type_size(); ++ pos ) {
+         for ( Integer d = 0; d < D; ++ d ) out(pos, d) = coordinates[d];
+         for ( Integer d = 0; d < D; ++ d ) {
+           if ( ++ coordinates[d] < c.boxes()[d] ) break;
+           coordinates[d] = 0;
+         }
+       }
+       return result;
+    })
+    .def("cell_shape_batch", [](CubicalComplex const& c, CellArray cells) {
+       return map_cells<Integer>(cells, [&](Integer x){return c.cell_shape(x);});
+    })
+    .def("cell_dim_batch", [](CubicalComplex const& c, CellArray cells) {
+       return map_cells<Integer>(cells, [&](Integer x){return c.cell_dim(x);});
+    })
+    .def("leftfringe_batch", [](CubicalComplex const& c, CellArray cells) {
+       return map_cells<bool>(cells, [&](Integer x){return c.leftfringe(x);});
+    })
+    .def("rightfringe_batch", [](CubicalComplex const& c, CellArray cells) {
+       return map_cells<bool>(cells, [&](Integer x){return c.rightfringe(x);});
+    })
+    .def("mincoords_batch", [](CubicalComplex const& c, CellArray cells) {
+       return map_cells<Integer>(cells, [&](Integer x){return c.mincoords(x);});
+    })
+    .def("maxcoords_batch", [](CubicalComplex const& c, CellArray cells) {
+       return map_cells<Integer>(cells, [&](Integer x){return c.maxcoords(x);});
+    })
+    .def("cell_dims_array", [](CubicalComplex const& c) {
+       // Dimensions of all cells as an (N,) array, filled type by type.
+       py::array_t<Integer> result(c.size());
+       auto out = result.mutable_unchecked<1>();
+       for ( Integer type = 0, cell = 0; type < (1L << c.dimension()); ++ type ) {
+         Integer dim = c.cell_dim(type * c.type_size());
+         for ( Integer pos = 0; pos < c.type_size(); ++ pos, ++ cell ) {
+           out(cell) = dim;
+         }
+       }
+       return result;
+    });
 }
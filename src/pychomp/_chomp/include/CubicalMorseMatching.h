@@ -120,6 +120,14 @@ class CubicalMorseMatching : public MorseMatching {
   /// priority
   Integer priority(Integer x) const { return type_size_ - x % type_size_; }
 
+  /// mates
+  ///   Mate of every cell, indexed by cell
+  std::vector<Integer> mates(void) const {
+    std::vector<Integer> result(complex_->size());
+    for (Integer x = 0; x < complex_->size(); ++x) result[x] = mate(x);
+    return result;
+  }
+
  private:
   Integer type_size_;
   std::shared_ptr<GradedComplex> graded_complex_;
@@ -160,6 +168,7 @@ class CubicalMorseMatching : public MorseMatching {
 
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include "NumpyArray.h"
 namespace py = pybind11;
 
 inline void CubicalMorseMatchingBinding(py::module &m) {
@@ -174,5 +183,8 @@ inline void CubicalMorseMatchingBinding(py::module &m) {
            py::arg("truncate") = false, py::arg("max_grade") = 0,
            py::arg("verbose") = false)
       .def("mate", &CubicalMorseMatching::mate)
-      .def("priority", &CubicalMorseMatching::priority);
+      .def("priority", &CubicalMorseMatching::priority)
+      .def("mates", [](CubicalMorseMatching const& matching) {
+        return as_array(matching.mates());
+      });
 }
@@ -218,6 +218,10 @@ class GenericMorseMatching : public MorseMatching {
   /// priority
   Integer priority(Integer x) const { return priority_[x]; }
 
+  /// mates
+  ///   Mate of every cell, indexed by cell
+  std::vector<Integer> const& mates(void) const { return mate_; }
+
  private:
   std::vector<Integer> mate_;
   std::vector<Integer> priority_;
@@ -227,6 +231,7 @@ class GenericMorseMatching : public MorseMatching {
 
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include "NumpyArray.h"
 namespace py = pybind11;
 
 inline void GenericMorseMatchingBinding(py::module& m) {
@@ -240,5 +245,8 @@ inline void GenericMorseMatchingBinding(py::module& m) {
            py::arg("truncate") = false, py::arg("max_grade") = 0,
            py::arg("verbose") = false)
       .def("mate", &GenericMorseMatching::mate)
-      .def("priority", &GenericMorseMatching::priority);
+      .def("priority", &GenericMorseMatching::priority)
+      .def("mates", [](py::object self) {
+        return as_array(self.cast<GenericMorseMatching const&>().mates(), self);
+      });
 }
@@ -5,7 +5,10 @@
 
 #pragma once
 
+#include <stdexcept>
+
 #include "Complex.h"
+#include "Grading.h"
 #include "Integer.h"
 
 class GradedComplex {
@@ -14,11 +17,36 @@ class GradedComplex {
   GradedComplex(std::shared_ptr<Complex> c, std::function<Integer(Integer)> v)
       : complex_(c), value_(v) {}
 
+  /// GradedComplex
+  ///   Construct from a table holding the value of every cell of `c`.
+  GradedComplex(std::shared_ptr<Complex> c, std::vector<Integer> values)
+      : GradedComplex(c, Grading(std::make_shared<std::vector<Integer> const>(
+                             std::move(values)))) {}
+
+  /// GradedComplex
+  ///   Construct from a grading table, which is shared rather than copied.
+  GradedComplex(std::shared_ptr<Complex> c, Grading const& grading)
+      : complex_(c), values_(grading.values()) {
+    if (values_->size() != c->size())
+      throw std::invalid_argument(
+          "GradedComplex values must have one entry per cell");
+  }
+
   /// complex
   std::shared_ptr<Complex> complex(void) const { return complex_; }
 
   /// value
-  Integer value(Integer i) const { return value_(i); }
+  Integer value(Integer i) const { return value_ ? value_(i) : (*values_)[i]; }
+
+  /// values
+  ///   Table of values indexed by cell. Shared when the complex was
+  ///   constructed from a table; otherwise evaluated for every cell.
+  std::shared_ptr<std::vector<Integer> const> values(void) const {
+    if (values_) return values_;
+    auto result = std::make_shared<std::vector<Integer>>(complex()->size());
+    for (Integer i = 0; i < complex()->size(); ++i) (*result)[i] = value_(i);
+    return result;
+  }
 
   /// count
   std::unordered_map<Integer, std::vector<Integer>> count(void) const {
@@ -37,21 +65,53 @@ class GradedComplex {
  private:
   std::shared_ptr<Complex> complex_;
   std::function<Integer(Integer)> value_;
+  std::shared_ptr<std::vector<Integer> const> values_;
 };
 
 /// Python Bindings
 
 #include <pybind11/functional.h>
+#include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
+#include "NumpyArray.h"
+
 namespace py = pybind11;
 
 inline void GradedComplexBinding(py::module &m) {
   py::class_<GradedComplex, std::shared_ptr<GradedComplex>>(m, "GradedComplex")
-      .def(
-          py::init<std::shared_ptr<Complex>, std::function<Integer(Integer)>>())
+      // Registered first so a Grading shares its table instead of being
+      // wrapped as a Python callable below.
+      .def(py::init<std::shared_ptr<Complex>, Grading const&>())
+      // A callable is evaluated once per cell up front, so later queries
+      // read the table instead of calling back into Python.
+      .def(py::init([](std::shared_ptr<Complex> c,
+                       std::function<Integer(Integer)> grading) {
+        std::vector<Integer> values(c->size());
+        for (Integer i = 0; i < c->size(); ++i) values[i] = grading(i);
+        return std::make_shared<GradedComplex>(c, std::move(values));
+      }))
+      // Grading given as an array of values indexed by cell; avoids calling
+      // back into Python every time a value is queried.
+      .def(py::init([](std::shared_ptr<Complex> c,
+                       py::array_t<Integer, py::array::c_style |
+                                                py::array::forcecast> values) {
+        if (values.ndim() != 1)
+          throw std::invalid_argument(
+              "GradedComplex values must be a one-dimensional array");
+        return std::make_shared<GradedComplex>(
+            c, std::vector<Integer>(values.data(),
+                                    values.data() + values.size()));
+      }))
       .def("complex", &GradedComplex::complex)
-      .def("value", &GradedComplex::value)
+      .def("value",
+           [](GradedComplex const& g, Integer i) {
+             if (i < 0 || i >= g.complex()->size())
+               throw py::index_error("cell out of range");
+             return g.value(i);
+           })
+      .def("values",
+           [](GradedComplex const& g) { return as_array(g.values()); })
       .def("count", &GradedComplex::count);
 }
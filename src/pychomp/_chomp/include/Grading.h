@@ -5,6 +5,7 @@
 
 #pragma once
 
+#include <stdexcept>
 #include <unordered_set>
 
 #include "Complex.h"
@@ -12,84 +13,179 @@
 #include "Integer.h"
 #include "common.h"
 
+/// Grading
+///   A grading stored as a table holding the value of every cell.
+class Grading {
+ public:
+  /// Grading
+  Grading(std::shared_ptr<std::vector<Integer> const> values)
+      : values_(values) {}
+
+  /// operator ()
+  Integer operator()(Integer x) const { return (*values_)[x]; }
+
+  /// values
+  ///   Table of values, indexed by cell
+  std::shared_ptr<std::vector<Integer> const> values(void) const {
+    return values_;
+  }
+
+ private:
+  std::shared_ptr<std::vector<Integer> const> values_;
+};
+
+/// extend_grading_
+///   Extend `values`, given on the top-dimensional cells of `c` and -1
+///   elsewhere, so each cell is graded by the minimum value in its
+///   top-dimensional star.
+Grading extend_grading_(
+    std::shared_ptr<Complex> c, std::shared_ptr<std::vector<Integer>> values) {
+  // Top cells are processed in increasing order of value and the closure of
+  // each is explored before moving on, so the first value a cell receives
+  // is already the minimum. Every cell is then assigned and expanded once.
+  // A value of -1 marks cells not yet reached.
+  auto& grading = *values;
+  std::vector<Integer> top_cells;
+  for (auto v : (*c)(c->dimension())) {
+    if (grading[v] != -1) top_cells.push_back(v);
+  }
+  std::stable_sort(top_cells.begin(), top_cells.end(),
+                   [&](Integer x, Integer y) { return grading[x] < grading[y]; });
+
+  std::vector<Integer> work_stack;
+  for (auto top_cell : top_cells) {
+    Integer value = grading[top_cell];
+    work_stack.push_back(top_cell);
+    while (not work_stack.empty()) {
+      Integer x = work_stack.back();
+      work_stack.pop_back();
+      c->column(x, [&](Integer y) {
+        if (grading[y] == -1) {
+          grading[y] = value;
+          work_stack.push_back(y);
+        }
+      });
+    }
+  }
+
+  return Grading(values);
+}
+
 /// construct_grading
 ///   Define a grading on the complex `c` subject to values on the
 ///   top-dimensional cells.
-std::function<Integer(Integer)> construct_grading(
+Grading construct_grading(
     std::shared_ptr<Complex> c,
     std::function<Integer(Integer)> top_cell_grading) {
-  // Copy top_cell_grading (with offset)
-  std::vector<Integer> top_cell_grading_;
-  top_cell_grading_.resize(c->size(c->dimension()));
-  Integer num_nontop_cells_ = c->size() - c->size(c->dimension());
+  auto values = std::make_shared<std::vector<Integer>>(c->size(), -1);
   for (auto v : (*c)(c->dimension())) {
-    top_cell_grading_[v - num_nontop_cells_] = top_cell_grading(v);
+    (*values)[v] = top_cell_grading(v);
   }
+  return extend_grading_(c, values);
+}
 
-  // Returned grading function calculates minimum value in the top-dimensional
-  // star of `x`.
-  return [=](Integer x) {
-    Integer min_value = -1;
-
-    for (auto v : c->topstar(x)) {
-      auto new_val = top_cell_grading_[v - num_nontop_cells_];
-
-      if (min_value == -1) {
-        min_value = new_val;
-      } else {
-        min_value = std::min(min_value, new_val);
-      }
-    }
-
-    return min_value;
-  };
+/// construct_grading
+///   Define a grading on the complex `c` subject to values on the
+///   top-dimensional cells, given in order of the top-dimensional cells.
+Grading construct_grading(
+    std::shared_ptr<Complex> c, std::vector<Integer> const& top_cell_values) {
+  Integer num_nontop_cells = c->size() - c->size(c->dimension());
+  if (top_cell_values.size() != c->size(c->dimension()))
+    throw std::invalid_argument(
+        "construct_grading requires one value per top-dimensional cell");
+  auto values = std::make_shared<std::vector<Integer>>(c->size(), -1);
+  std::copy(top_cell_values.begin(), top_cell_values.end(),
+            values->begin() + num_nontop_cells);
+  return extend_grading_(c, values);
 }
 
 /// inclusion_grading
 ///   Define a grading based on inclusion in `included`. All cells of `c` in
 ///   the closure of `included` are graded 0; others are graded 1.
-std::function<Integer(Integer)> inclusion_grading(
+Grading inclusion_grading(
     std::shared_ptr<Complex> c, std::unordered_set<Integer> const& included) {
-  auto included_closure = c->closure(included);
-  return [=](Integer x) {
-    if (included_closure.count(x)) return 0;
-    return 1;
-  };
+  auto values = std::make_shared<std::vector<Integer>>(c->size(), 1);
+  for (auto x : c->closure(included)) (*values)[x] = 0;
+  return Grading(values);
+}
+
+/// dim_grading
+///   Define a grading on `c` in which the cells of dimension `dim` are graded
+///   1 and all others 0.
+Grading dim_grading(std::shared_ptr<Complex> c, Integer dim) {
+  if (dim < 0 || dim > c->dimension())
+    throw std::invalid_argument("dim_grading dimension out of range");
+  auto values = std::make_shared<std::vector<Integer>>(c->size(), 0);
+  for (auto x : (*c)(dim)) (*values)[x] = 1;
+  return Grading(values);
 }
 
 /// cubical_nerve
 ///   Define a grading on a cubical complex `c` selecting those cells which have
 ///   all their vertices' positions in `positions`, up to dimension `max_dim`.
-std::function<Integer(Integer)> cubical_nerve(
+Grading cubical_nerve(
     std::shared_ptr<CubicalComplex> c,
     std::unordered_set<Integer> const& positions, Integer max_dim = -1) {
-  CubicalComplex complex = *c;
-  if (max_dim == -1) max_dim = complex.dimension();
-  Integer vertex_count = complex.size(0);
-
-  return [=](Integer x) {
-    if (complex.cell_dim(x) > max_dim) return 1;
-    for (Integer y : complex.closure({x})) {
-      // y < vertex_count iff y is a 0-cell
-      if (y < vertex_count && positions.count(complex.cell_pos(y)) == 0) {
-        return 1;
-      }
+  if (max_dim == -1 || max_dim > c->dimension()) max_dim = c->dimension();
+  // Cells are ordered by dimension, so the faces of a cell are decided
+  // before it. A cell has all its vertices in `positions` iff each of its
+  // boundary faces does; `nerve` records this up to dimension `max_dim`.
+  std::vector<bool> nerve(c->size(), false);
+  if (max_dim >= 0) {
+    for (auto x : (*c)(0)) nerve[x] = positions.count(c->cell_pos(x)) != 0;
+  }
+  for (Integer d = 1; d <= max_dim; ++d) {
+    for (auto x : (*c)(d)) {
+      bool result = true;
+      for (auto y : c->boundary({x})) result = result && nerve[y];
+      nerve[x] = result;
     }
-    return 0;
-  };
+  }
+  auto values = std::make_shared<std::vector<Integer>>(c->size());
+  for (Integer x = 0; x < c->size(); ++x) (*values)[x] = nerve[x] ? 0 : 1;
+  return Grading(values);
 }
 
 /// Python Bindings
 
 #include <pybind11/functional.h>
+#include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
+#include "NumpyArray.h"
+
 namespace py = pybind11;
 
 inline void GradingBinding(py::module& m) {
-  m.def("construct_grading", &construct_grading);
+  py::class_<Grading, std::shared_ptr<Grading>>(m, "Grading")
+      .def("__call__",
+           [](Grading const& g, Integer x) {
+             if (x < 0 || x >= (Integer)g.values()->size())
+               throw py::index_error("cell out of range");
+             return g(x);
+           })
+      .def("values",
+           [](Grading const& g) { return as_array(g.values()); });
+  m.def("construct_grading",
+        (Grading(*)(std::shared_ptr<Complex>,
+                    std::function<Integer(Integer)>)) &
+            construct_grading);
+  // Top cell values given as an array; avoids a Python call per top cell.
+  m.def("construct_grading",
+        [](std::shared_ptr<Complex> c,
+           py::array_t<Integer, py::array::c_style | py::array::forcecast>
+               top_cell_values) {
+          if (top_cell_values.ndim() != 1)
+            throw std::invalid_argument(
+                "construct_grading values must be a one-dimensional array");
+          return construct_grading(
+              c, std::vector<Integer>(
+                     top_cell_values.data(),
+                     top_cell_values.data() + top_cell_values.size()));
+        });
   m.def("inclusion_grading", &inclusion_grading);
+  m.def("dim_grading", &dim_grading, py::arg("complex"), py::arg("dim"));
   m.def("cubical_nerve", &cubical_nerve, py::arg("complex"),
         py::arg("positions"), py::arg("max_dim") = -1);
 }
@@ -7,8 +7,10 @@
 
 #include <memory>
 #include <queue>
+#include <stdexcept>
+#include <algorithm>
 #include <tuple>
-#include <unordered_map>
+#include <utility>
 #include <vector>
 
 #include "Chain.h"
@@ -37,8 +39,10 @@ class MorseComplex : public Complex {
     for (auto pair : reindex) {
       include_.push_back(pair.first);
     }
-    project_ =
-        std::unordered_map<Integer, Integer>(reindex.begin(), reindex.end());
+    // Sorted by base cell so project is a binary search
+    project_ = reindex;
+    if (not std::is_sorted(project_.begin(), project_.end()))
+      std::sort(project_.begin(), project_.end());
 
     // boundary
     bd_.resize(size());
@@ -61,16 +65,18 @@ class MorseComplex : public Complex {
 
   /// boundary
   virtual Chain boundary(Chain const& c) const final {
-    Chain result;
-    for (auto x : c) result += bd_[x];
-    return result;
+    std::vector<Integer> entries;
+    for (auto x : c) entries.insert(entries.end(), bd_[x].begin(), bd_[x].end());
+    reduce_(entries, 0);
+    return Chain(entries.begin(), entries.end());
   }
 
   /// coboundary
   virtual Chain coboundary(Chain const& c) const final {
-    Chain result;
-    for (auto x : c) result += cbd_[x];
-    return result;
+    std::vector<Integer> entries;
+    for (auto x : c) entries.insert(entries.end(), cbd_[x].begin(), cbd_[x].end());
+    reduce_(entries, 0);
+    return Chain(entries.begin(), entries.end());
   }
 
   /// column
@@ -99,6 +105,7 @@ class MorseComplex : public Complex {
 
   /// include
   Chain include(Chain const& c) {
+    check_cells_(c, size());
     Chain result;
     for (auto x : c) result += include_[x];
     return result;
@@ -108,7 +115,12 @@ class MorseComplex : public Complex {
   Chain project(Chain const& c) {
     Chain result;
     for (auto x : c) {
-      if (project_.count(x) > 0) result += project_[x];
+      auto it = std::lower_bound(
+          project_.begin(), project_.end(), x,
+          [](std::pair<Integer, Integer> const& p, Integer y) {
+            return p.first < y;
+          });
+      if (it != project_.end() && it->first == x) result += it->second;
     }
     return result;
   }
@@ -122,6 +134,18 @@ class MorseComplex : public Complex {
     return included + gamma;
   }
 
+  /// lift_csr
+  ///   Return the lift as a matrix in compressed form (indptr, indices),
+  ///   where the lift of Morse cell i is indices[indptr[i]:indptr[i+1]].
+  ///   Computed on first use and kept; lift itself does not use it.
+  std::pair<std::vector<Integer>, std::vector<Integer>> const&
+  lift_csr(void) {
+    if (lift_.first.empty()) {
+      lift_ = table_([&](Integer ace) { return lift({ace}); });
+    }
+    return lift_;
+  }
+
   /// lower
   Chain lower(Chain const& c) {
     Chain canonical;
@@ -132,7 +156,10 @@ class MorseComplex : public Complex {
 
   /// flow
   std::pair<Chain, Chain> flow(Chain const& input) const {
-    Chain canonical, gamma;
+    check_cells_(input, base()->size());
+    Chain gamma;
+    std::vector<Integer> touched;
+    next_epoch_();
     auto isQueen = [&](Integer x) { return x < matching_->mate(x); };
 
     // Partial ordering on queens handled by priority queue
@@ -144,7 +171,7 @@ class MorseComplex : public Complex {
 
     auto process = [&](Integer x) {
       if (isQueen(x)) priority.push(x);
-      canonical += x;
+      toggle_(x, touched);
     };
 
     for (auto x : input) process(x);
@@ -152,13 +179,32 @@ class MorseComplex : public Complex {
     while (not priority.empty()) {
       auto queen = priority.top();
       priority.pop();
-      if (canonical.count(queen) == 0) continue;
+      if (mark_[queen] != epoch_) continue;
       auto king = matching_->mate(queen);
       gamma += king;
       base()->column(king, process);
     }
 
-    return {canonical, gamma};
+    return {collect_(touched), gamma};
+  }
+
+  /// verify_cycles
+  ///   Return true if every Morse cell lifts to a cycle of the base
+  ///   complex, i.e. the boundary of the base composed with lift vanishes.
+  ///   Stops at the first Morse cell whose lift has nonzero boundary.
+  bool verify_cycles(void) {
+    auto const& table = lift_csr();
+    std::vector<Integer> entries;
+    auto append = [&](Integer x) { entries.push_back(x); };
+    for (Integer ace = 0; ace < size(); ++ace) {
+      entries.clear();
+      for (auto i = table.first[ace]; i < table.first[ace + 1]; ++i) {
+        base()->column(table.second[i], append);
+      }
+      reduce_(entries, 0);
+      if (not entries.empty()) return false;
+    }
+    return true;
   }
 
   /// colift
@@ -170,6 +216,18 @@ class MorseComplex : public Complex {
     return included + cogamma;
   }
 
+  /// colift_csr
+  ///   Return the colift as a matrix in compressed form (indptr, indices),
+  ///   where the colift of Morse cell i is indices[indptr[i]:indptr[i+1]].
+  ///   Computed on first use and kept; colift itself does not use it.
+  std::pair<std::vector<Integer>, std::vector<Integer>> const&
+  colift_csr(void) {
+    if (colift_.first.empty()) {
+      colift_ = table_([&](Integer ace) { return colift({ace}); });
+    }
+    return colift_;
+  }
+
   /// colower
   Chain colower(Chain const& c) {
     Chain cocanonical;
@@ -182,7 +240,10 @@ class MorseComplex : public Complex {
   ///   Dualization of flow exchanges role of kings and queens for their
   ///   cocell counterparts.
   std::pair<Chain, Chain> coflow(Chain const& input) const {
-    Chain cocanonical, cogamma;
+    check_cells_(input, base()->size());
+    Chain cogamma;
+    std::vector<Integer> touched;
+    next_epoch_();
     auto isKing = [&](Integer x) { return x > matching_->mate(x); };
 
     // Partial ordering on kings handled by priority queue
@@ -194,7 +255,7 @@ class MorseComplex : public Complex {
 
     auto process = [&](Integer x) {
       if (isKing(x)) priority.push(x);
-      cocanonical += x;
+      toggle_(x, touched);
     };
 
     for (auto x : input) process(x);
@@ -202,30 +263,115 @@ class MorseComplex : public Complex {
     while (not priority.empty()) {
       auto king = priority.top();
       priority.pop();
-      if (cocanonical.count(king) == 0) continue;
+      if (mark_[king] != epoch_) continue;
       auto queen = matching_->mate(king);
       cogamma += queen;
       base()->row(queen, process);
     }
 
-    return {cocanonical, cogamma};
+    return {collect_(touched), cogamma};
   }
 
  private:
+  /// check_cells_
+  ///   Throw unless every cell of `c` is a cell of a complex of size `n`
+  static void check_cells_(Chain const& c, Integer n) {
+    for (auto x : c) {
+      if (x < 0 || x >= n) throw std::out_of_range("cell out of range");
+    }
+  }
+
+  typedef std::pair<std::vector<Integer>, std::vector<Integer>> Table;
+
+  /// table_
+  ///   Tabulate the chain `f` assigns to each Morse cell in compressed
+  ///   form, with the entries of each chain sorted
+  template <typename F>
+  Table table_(F const& f) const {
+    Table result;
+    result.first.reserve(size() + 1);
+    result.first.push_back(0);
+    for (Integer ace = 0; ace < size(); ++ace) {
+      Chain chain = f(ace);
+      auto begin = result.second.size();
+      result.second.insert(result.second.end(), chain.begin(), chain.end());
+      std::sort(result.second.begin() + begin, result.second.end());
+      result.first.push_back(result.second.size());
+    }
+    return result;
+  }
+
+  /// next_epoch_
+  ///   Start a new flow. A base cell is in the current (co)canonical chain
+  ///   iff its mark equals epoch_, so no clearing is needed between flows.
+  void next_epoch_(void) const {
+    if (mark_.size() != base()->size()) {
+      mark_.assign(base()->size(), 0);
+      epoch_ = 0;
+    }
+    if (++epoch_ == 0) {
+      std::fill(mark_.begin(), mark_.end(), 0);
+      epoch_ = 1;
+    }
+  }
+
+  /// toggle_
+  ///   Add x to the current chain with Z_2 coefficients
+  void toggle_(Integer x, std::vector<Integer>& touched) const {
+    mark_[x] = (mark_[x] == epoch_) ? 0 : epoch_;
+    touched.push_back(x);
+  }
+
+  /// collect_
+  ///   Return the current chain, given every cell toggled into it
+  Chain collect_(std::vector<Integer> const& touched) const {
+    Chain result;
+    for (auto x : touched) {
+      if (mark_[x] == epoch_) {
+        result.insert(x);
+        mark_[x] = 0;
+      }
+    }
+    return result;
+  }
+
   std::shared_ptr<Complex> base_;
   std::shared_ptr<MorseMatching> matching_;
   std::vector<Integer> include_;
-  std::unordered_map<Integer, Integer> project_;
+  std::vector<std::pair<Integer, Integer>> project_;
   std::vector<Chain> bd_;
   std::vector<Chain> cbd_;
+  Table lift_;
+  Table colift_;
+  mutable std::vector<uint32_t> mark_;
+  mutable uint32_t epoch_ = 0;
 };
 
 /// Python Bindings
 
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include "NumpyArray.h"
 namespace py = pybind11;
 
+/// as_sparse_matrix_
+///   Wrap a table of chains indexed by Morse cell (see MorseComplex::lift_csr)
+///   as a scipy.sparse.csr_matrix of shape (base size, Morse size) with
+///   int8 entries, so that matrix.dot(v) % 2 applies it to an indicator
+///   vector v.
+inline py::object as_sparse_matrix_(
+    std::pair<std::vector<Integer>, std::vector<Integer>> const& table,
+    Integer rows, Integer cols) {
+  auto sparse = py::module::import("scipy.sparse");
+  std::vector<int8_t> data(table.second.size(), 1);
+  auto matrix = sparse.attr("csc_matrix")(
+      py::make_tuple(as_array(std::move(data)),
+                     as_array(std::vector<Integer>(table.second)),
+                     as_array(std::vector<Integer>(table.first))),
+      py::arg("shape") = py::make_tuple(rows, cols));
+  return matrix.attr("tocsr")();
+}
+
 inline void MorseComplexBinding(py::module& m) {
   py::class_<MorseComplex, std::shared_ptr<MorseComplex>, Complex>(
       m, "MorseComplex")
@@ -238,7 +384,24 @@ inline void MorseComplexBinding(py::module& m) {
       .def("lift", &MorseComplex::lift)
       .def("lower", &MorseComplex::lower)
       .def("flow", &MorseComplex::flow)
+      .def("lift_csr", [](MorseComplex& mc) {
+         auto const& csr = mc.lift_csr();
+         return py::make_tuple(as_array(std::vector<Integer>(csr.first)),
+                               as_array(std::vector<Integer>(csr.second)));
+       })
+      .def("lift_matrix", [](MorseComplex& mc) {
+         return as_sparse_matrix_(mc.lift_csr(), mc.base()->size(), mc.size());
+       })
+      .def("verify_cycles", &MorseComplex::verify_cycles)
       .def("colift", &MorseComplex::colift)
+      .def("colift_csr", [](MorseComplex& mc) {
+         auto const& csr = mc.colift_csr();
+         return py::make_tuple(as_array(std::vector<Integer>(csr.first)),
+                               as_array(std::vector<Integer>(csr.second)));
+       })
+      .def("colift_matrix", [](MorseComplex& mc) {
+         return as_sparse_matrix_(mc.colift_csr(), mc.base()->size(), mc.size());
+       })
       .def("colower", &MorseComplex::colower)
       .def("coflow", &MorseComplex::coflow)
       .def("base", &MorseComplex::base)
@@ -28,8 +28,8 @@ inline std::shared_ptr<GradedComplex> MorseGradedComplex(
     graded_complex_mapping[x] = base_graded_complex->value(*included.begin());
   }
 
-  return std::shared_ptr<GradedComplex>(new GradedComplex(
-      complex, [=](Integer x) { return graded_complex_mapping[x]; }));
+  return std::shared_ptr<GradedComplex>(
+      new GradedComplex(complex, std::move(graded_complex_mapping)));
 }
 
 /// MorseGradedComplex
@@ -0,0 +1,86 @@
+/// NumpyArray.h
+/// 2026-10-15
+/// MIT LICENSE
+
+#pragma once
+
+#include <memory>
+#include <stdexcept>
+#include <utility>
+#include <vector>
+
+#include "Integer.h"
+
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+namespace py = pybind11;
+
+/// as_array
+///   Move `v` into a one-dimensional NumPy array without copying the data.
+///   The array takes ownership of the vector's buffer.
+template <typename T>
+py::array_t<T>
+as_array ( std::vector<T> && v ) {
+  auto owner = new std::vector<T>(std::move(v));
+  py::capsule free_when_done(owner, [](void * p) {
+    delete static_cast<std::vector<T> *>(p);
+  });
+  return py::array_t<T>(owner->size(), owner->data(), free_when_done);
+}
+
+/// as_array
+///   View a shared table as a read-only one-dimensional NumPy array
+///   without copying. The array keeps the table alive.
+template <typename T>
+py::array_t<T>
+as_array ( std::shared_ptr<std::vector<T> const> v ) {
+  auto owner = new std::shared_ptr<std::vector<T> const>(v);
+  py::capsule release(owner, [](void * p) {
+    delete static_cast<std::shared_ptr<std::vector<T> const> *>(p);
+  });
+  py::array_t<T> result(v->size(), v->data(), release);
+  result.attr("flags").attr("writeable") = false;
+  return result;
+}
+
+/// as_array
+///   View a vector owned by the Python object `owner` as a read-only
+///   one-dimensional NumPy array without copying. The array keeps
+///   `owner` alive.
+template <typename T>
+py::array_t<T>
+as_array ( std::vector<T> const& v, py::handle owner ) {
+  py::array_t<T> result(v.size(), v.data(), owner);
+  result.attr("flags").attr("writeable") = false;
+  return result;
+}
+
+/// CellArray
+///   One-dimensional array of cell indices accepted by the bindings
+typedef py::array_t<Integer, py::array::c_style | py::array::forcecast> CellArray;
+
+/// as_vector
+///   Copy a one-dimensional array of cell indices into a vector
+inline std::vector<Integer>
+as_vector ( CellArray const& cells ) {
+  if ( cells.ndim() != 1 ) {
+    throw std::invalid_argument("Expected a one-dimensional array of cells");
+  }
+  return std::vector<Integer>(cells.data(), cells.data() + cells.size());
+}
+
+/// map_cells
+///   Apply `f` to each of a one-dimensional array of cells, returning the
+///   results as an array of type T
+template <typename T, typename F>
+py::array_t<T>
+map_cells ( CellArray const& cells, F const& f ) {
+  if ( cells.ndim() != 1 ) {
+    throw std::invalid_argument("Expected a one-dimensional array of cells");
+  }
+  py::array_t<T> result(cells.size());
+  T * out = result.mutable_data();
+  Integer const* in = cells.data();
+  for ( py::ssize_t i = 0; i < cells.size(); ++ i ) out[i] = f(in[i]);
+  return result;
+}
@@ -1,5 +1,8 @@
 """Testing script for CubicalComplex.h"""
 
+import numpy as np
+import pytest
+
 from pychomp import *
 
 """
@@ -152,6 +155,16 @@ def test_cells():
     assert X.coordinates(42) == [0, 2]
     assert X.barycenter(42) == [1, 5]
 
+    assert X.barycenters_array().shape == (48, 2)
+    assert X.barycenters_array().tolist() == [X.barycenter(cell) for cell in X]
+    assert X.cell_dims_array().tolist() == [X.cell_dim(cell) for cell in X]
+    assert X.cell_dims_array().dtype == X.cell_dim_batch(X.cells()).dtype
+    assert X.cell_shape_batch(np.arange(48)).tolist() == [
+        X.cell_shape(cell) for cell in X]
+    assert X.cell_dim_batch([47, 0, 12]).tolist() == [2, 0, 1]
+    assert X.top_coordinates_array().tolist() == [
+        X.coordinates(cell) for cell in X(X.dimension())]
+
     Y = CubicalComplex([3, 3, 3])
     assert Y.dimension() == 3
     assert len(Y) == 216
@@ -170,6 +183,9 @@ def test_cells():
     for cell in Y:
       cell_list.append(cell)
     assert cell_list == list(range(216))
+    assert np.array_equal(Y.cells(), np.arange(216))
+    for d in range(Y.dimension() + 1):
+      assert np.array_equal(Y.cells_of_dim(d), list(Y(d)))
     for cell in Y(0):
       assert cell == 0
       break
@@ -216,6 +232,13 @@ def test_boundary():
     assert X.boundary({16, 19}) == {4, 5, 7, 8}
     assert X.boundary({36, 37, 39, 40}) == {12, 13, 18, 19, 24, 26, 27, 29}
 
+    assert np.array_equal(X.boundary_sorted(0), [])
+    assert np.array_equal(X.boundary_sorted(12), [0, 1])
+    assert np.array_equal(X.boundary_sorted(47), [14, 23, 24, 35])
+    assert np.array_equal(X.boundary_sorted([25, 28, 31]), [1, 10])
+    for cell in X:
+        assert X.boundary_sorted(cell).tolist() == sorted(X.boundary({cell}))
+
     Y = CubicalComplex([3, 3, 3])
 
     assert Y.boundary({9}) == set()
@@ -223,14 +246,21 @@ def test_boundary():
     assert Y.boundary({35}) == {8, 9}
     assert Y.boundary({62}) == {8, 11}
     assert Y.boundary({101}) == {2, 20}
-    for cell in Y(0): assert len(Y.boundary({cell})) == 0
-    for cell in Y(1): assert len(Y.boundary({cell})) == 2
-    for cell in Y(2): assert len(Y.boundary({cell})) == 4
-    for cell in Y(3): assert len(Y.boundary({cell})) == 6
+    for dim in range(4):
+        indptr, indices = Y.boundary_batch(list(Y(dim)))
+        assert np.all(np.diff(indptr) == 2 * dim)
+    indptr, indices = Y.boundary_batch(np.array([31, 62, 101]))
+    assert indptr.tolist() == [0, 2, 4, 6]
+    assert indices.tolist() == [4, 5, 8, 11, 2, 20]
 
     assert Y.boundary({36, 39, 64}) == {9, 12}
     assert Y.boundary({36, 39, 63, 64}) == set()
 
+    indptr, indices = Y.boundary_csr()
+    assert len(indptr) == Y.size() + 1
+    for cell in Y:
+        assert set(indices[indptr[cell]:indptr[cell+1]]) == Y.boundary({cell})
+
 
 def test_coboundary():
     X = CubicalComplex([3, 4])
@@ -247,13 +277,28 @@ def test_coboundary():
     assert X.coboundary({12, 15, 18, 21}) == set()
     assert X.coboundary({36, 37, 38}) == set()
 
+    assert np.array_equal(X.coboundary_sorted(0), [12, 23, 24, 33])
+    assert np.array_equal(X.coboundary_sorted(36), [])
+    assert np.array_equal(X.coboundary_sorted(np.array([4, 5, 7, 8])),
+                          [15, 17, 18, 20, 25, 26, 31, 32])
+    for cell in X:
+        assert X.coboundary_sorted(cell).tolist() == sorted(X.coboundary({cell}))
+
     Y = CubicalComplex([3, 3, 3])
     assert Y.coboundary({0}) == {27, 53, 54, 78, 81, 99}
     assert Y.coboundary({13}) == {39, 40, 64, 67, 85, 94}
-    for cell in Y(0): assert len(Y.coboundary({cell})) == 6
-    for cell in Y(1): assert len(Y.coboundary({cell})) == 4
-    for cell in Y(2): assert len(Y.coboundary({cell})) == 2
-    for cell in Y(3): assert len(Y.coboundary({cell})) == 0
+    for dim in range(4):
+        indptr, indices = Y.coboundary_batch(list(Y(dim)))
+        assert np.all(np.diff(indptr) == 6 - 2 * dim)
+    indptr, indices = Y.coboundary_batch(np.array([0, 13]))
+    assert indptr.tolist() == [0, 6, 12]
+    assert indices.tolist() == [27, 53, 54, 78, 81, 99, 39, 40, 64, 67, 85, 94]
+
+    Z = CubicalComplex([3, 3, 3], precompute_coboundary=True)
+    assert Z.coboundary({0}) == {27, 53, 54, 78, 81, 99}
+    assert Z.coboundary({36, 37, 38}) == Y.coboundary({36, 37, 38})
+    for cell in Y:
+        assert Z.coboundary({cell}) == Y.coboundary({cell})
 
 
 def test_closure():
@@ -264,6 +309,7 @@ def test_closure():
     assert X.closure({38}) == {2, 3, 5, 6, 14, 17, 26, 27, 38}
 
     assert X.closure({0, 4, 5, 16, 40}) == {0, 4, 5, 7, 8, 16, 19, 28, 29, 40}
+    assert X.closure(np.array([0, 4, 5, 16, 40])) == X.closure({0, 4, 5, 16, 40})
 
     Y = CubicalComplex([3, 3, 3])
 
@@ -271,6 +317,11 @@ def test_closure():
     assert Y.closure({51}) == {24, 25, 51}
     assert Y.closure({43, 97, 98}) == {16, 17, 25, 26, 43, 97, 98}
 
+    with pytest.raises(IndexError):
+        X.closure({X.size()})
+    with pytest.raises(IndexError):
+        X.closure(np.array([0, -1]))
+
 
 def test_star():
     X = CubicalComplex([3, 4])
@@ -280,6 +331,9 @@ def test_star():
     assert X.star({40}) == {40}
 
     assert X.star({0, 12, 13}) == X.star({0}) | X.star({12}) | X.star({13})
+    assert X.star(np.array([0, 12, 13, 12])) == X.star({0, 12, 13})
+    with pytest.raises(IndexError):
+        X.star({-1})
 
     # `topstar` takes in a single cell (integer) and outputs a list
     # very different behavior than `star`
@@ -362,6 +416,10 @@ def test_leftright():
     assert not Y.rightfringe(77)
     assert Y.rightfringe(50)
 
+    cells = np.arange(Y.size())
+    assert Y.leftfringe_batch(cells).tolist() == [Y.leftfringe(c) for c in Y]
+    assert Y.rightfringe_batch(cells).tolist() == [Y.rightfringe(c) for c in Y]
+
 
 def test_coords():
     X = CubicalComplex([3, 4])
@@ -392,6 +450,9 @@ def test_coords():
     assert Y.mincoords(35) == 0b100
     assert Y.maxcoords(35) == 0b011
 
+    assert Y.mincoords_batch([21, 14, 91, 35]).tolist() == [0b001, 0b000, 0b010, 0b100]
+    assert Y.maxcoords_batch([21, 14, 91, 35]).tolist() == [0b100, 0b001, 0b000, 0b011]
+
 
 def test_parallelneighbors():
     X = CubicalComplex([3, 4])
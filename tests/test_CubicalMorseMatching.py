@@ -1,5 +1,7 @@
 """Testing script for CubicalMorseMatching.h"""
 
+import numpy as np
+
 from pychomp import *
 
 def test_matching():
@@ -8,10 +10,10 @@ def test_matching():
     X_match = CubicalMorseMatching(X)
 
     # Check trichotomy
-    for cell in range(X.size()):
-        mate = X_match.mate(cell)
-        assert mate < X.size()
-        assert mate == cell or X_match.mate(mate) == cell
+    mates = X_match.mates()
+    cells = np.arange(X.size())
+    assert np.all(mates < X.size())
+    assert np.all((mates == cells) | (mates[mates] == cells))
 
     def grading(cell):
         if cell in {0, 1, 3, 4, 12, 15, 24, 25}:
@@ -23,18 +25,15 @@ def test_matching():
     Y_match = CubicalMorseMatching(Y_grad)
 
     # Check trichotomy
-    for cell in range(Y.size()):
-        mate = Y_match.mate(cell)
-        assert mate < Y.size()
-        assert mate == cell or Y_match.mate(mate) == cell
+    mates = Y_match.mates()
+    cells = np.arange(Y.size())
+    assert np.all(mates < Y.size())
+    assert np.all((mates == cells) | (mates[mates] == cells))
 
 
 def test_truncated_matching():
     X = CubicalComplex([3, 4])
-    def grading(cell):
-        if X.cell_dim(cell) == 2:
-            return 1
-        return 0
+    grading = dim_grading(X, 2)
     grad_X = GradedComplex(X, grading)
     X_match = CubicalMorseMatching(grad_X, truncate=True, max_grade=0)
 
@@ -1,5 +1,8 @@
 """Testing script for GradedComplex.h"""
 
+import numpy as np
+import pytest
+
 from pychomp import *
 
 def test_cubical_graded_complex():
@@ -27,5 +30,29 @@ def test_cubical_graded_complex():
     assert gradX.count()[2] == [2, 6, 3]
     assert gradX.count()[3] == [0, 2, 3]
 
-    for cell in gradX.complex():
+    # Each cell takes the minimum value of the top cells in its star
+    expected = [min(top_grading(top) for top in X.topstar(cell)) for cell in X]
+    assert gradX.values().tolist() == expected
+    assert gradX.values().tolist() == [gradX.value(cell) for cell in X]
+
+def test_graded_complex_values():
+    X = CubicalComplex([3, 4])
+
+    def grading(cell):
+        if X.cell_dim(cell) == 2:
+            return 1
+        return 0
+
+    values = [grading(cell) for cell in X]
+    gradX = GradedComplex(X, values)
+
+    assert gradX.count() == GradedComplex(X, grading).count()
+    for cell in X:
         assert gradX.value(cell) == grading(cell)
+    assert gradX.values().tolist() == values
+    assert GradedComplex(X, grading).values().tolist() == values
+
+    with pytest.raises(IndexError):
+        gradX.value(X.size())
+    with pytest.raises(IndexError):
+        GradedComplex(X, lambda cell: 0).value(-1)
@@ -1,5 +1,7 @@
 """Testing script for Grading.h"""
 
+import pytest
+
 from pychomp import *
 
 def test_top_grading():
@@ -30,6 +32,13 @@ def test_top_grading():
     assert grading(20) == 1
     assert grading(35) == 3
 
+    assert grading.values().tolist() == [grading(cell) for cell in X]
+
+    top_values = [top_grading(cell) for cell in X(X.dimension())]
+    values_grading = construct_grading(X, top_values)
+    for cell in X:
+        assert values_grading(cell) == grading(cell)
+
 def test_inclusion_grading():
     include = {1, 6, 12, 18, 24, 25, 39}
     full = {0, 1, 3, 4, 6, 7, 12, 15, 18, 24, 25, 27, 28, 39}
@@ -42,6 +51,20 @@ def test_inclusion_grading():
             assert grading(cell) == 0
         else:
             assert grading(cell) == 1
+    assert list(grading.values()) == [grading(cell) for cell in X]
+
+    with pytest.raises(IndexError):
+        grading(X.size())
+    with pytest.raises(IndexError):
+        grading(-1)
+
+def test_dim_grading():
+    X = CubicalComplex([3, 4])
+    grading = dim_grading(X, 2)
+
+    for cell in X:
+        assert grading(cell) == (1 if X.cell_dim(cell) == 2 else 0)
+    assert list(grading.values()) == [grading(cell) for cell in X]
 
 def test_cubical_nerve():
     positions = {0, 1, 2, 3, 4, 9, 10, 11, 12, 13, 14, 18}
@@ -60,3 +83,4 @@ def test_cubical_nerve():
         else:
             assert grading(cell) == 1
     assert squares == square_count
+    assert list(grading.values()) == [grading(cell) for cell in X]
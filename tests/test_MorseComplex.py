@@ -1,5 +1,8 @@
 """Testing script for MorseComplex.h"""
 
+import numpy as np
+import pytest
+
 from pychomp import *
 
 """
@@ -47,10 +50,7 @@ After cubical morse matching, critical cells are:
 def test_instantiation():
     X = CubicalComplex([3, 4])
 
-    def grading(cell):
-        if X.cell_dim(cell) == 2:
-            return 1
-        return 0
+    grading = dim_grading(X, 2)
 
     grad_X = GradedComplex(X, grading)
     morse_X = MorseGradedComplex(grad_X, truncate=True, max_grade=0).complex()
@@ -77,10 +77,7 @@ def test_instantiation():
 def test_include_project():
     X = CubicalComplex([3, 4])
 
-    def grading(cell):
-        if X.cell_dim(cell) == 2:
-            return 1
-        return 0
+    grading = dim_grading(X, 2)
 
     grad_X = GradedComplex(X, grading)
     morse_X = MorseGradedComplex(grad_X, truncate=True, max_grade=0).complex()
@@ -99,10 +96,7 @@ def test_include_project():
 def test_boundary():
     X = CubicalComplex([3, 4])
 
-    def grading(cell):
-        if X.cell_dim(cell) == 2:
-            return 1
-        return 0
+    grading = dim_grading(X, 2)
 
     grad_X = GradedComplex(X, grading)
     morse_X = MorseGradedComplex(grad_X, truncate=True, max_grade=0).complex()
@@ -114,10 +108,7 @@ def test_boundary():
 def test_coboundary():
     X = CubicalComplex([3, 4])
 
-    def grading(cell):
-        if X.cell_dim(cell) == 2:
-            return 1
-        return 0
+    grading = dim_grading(X, 2)
 
     grad_X = GradedComplex(X, grading)
     morse_X = MorseGradedComplex(grad_X, truncate=True, max_grade=0).complex()
@@ -129,10 +120,7 @@ def test_coboundary():
 def test_flow():
     X = CubicalComplex([3, 4])
 
-    def grading(cell):
-        if X.cell_dim(cell) == 2:
-            return 1
-        return 0
+    grading = dim_grading(X, 2)
 
     grad_X = GradedComplex(X, grading)
     morse_X = MorseGradedComplex(grad_X, truncate=True, max_grade=0).complex()
@@ -159,13 +147,15 @@ def test_flow():
             {cell}, set()
         )
 
+    with pytest.raises(IndexError):
+        morse_X.flow({-3})
+    with pytest.raises(IndexError):
+        morse_X.flow({X.size()})
+
 def test_lift_lower():
     X = CubicalComplex([3, 4])
 
-    def grading(cell):
-        if X.cell_dim(cell) == 2:
-            return 1
-        return 0
+    grading = dim_grading(X, 2)
 
     grad_X = GradedComplex(X, grading)
     morse_X = MorseGradedComplex(grad_X, truncate=True, max_grade=0).complex()
@@ -182,8 +172,23 @@ def test_lift_lower():
 
     # As this is the minimal morse complex, each cell in the morse
     # complex should lift to a homology generator, which is a cycle
+    assert morse_X.verify_cycles()
+
+    # Without truncation the 2-cells in grade 1 stay critical and lift to
+    # chains with nonzero boundary, so not every lift is a cycle
+    full_morse_X = MorseGradedComplex(grad_X).complex()
+    assert any(X.boundary(full_morse_X.lift({cell})) for cell in full_morse_X)
+    assert not full_morse_X.verify_cycles()
+
+    # The compressed lift table agrees with lift
+    indptr, indices = morse_X.lift_csr()
     for cell in morse_X:
-        assert X.boundary(morse_X.lift({cell})) == set()
+        assert set(indices[indptr[cell]:indptr[cell+1]]) == morse_X.lift({cell})
+
+    with pytest.raises(IndexError):
+        morse_X.lift({morse_X.size()})
+    with pytest.raises(IndexError):
+        morse_X.colift({-1})
 
     # The canonical "part" of all 0-cells is just {11},
     # which projects to morse_X.project({11}) == {0}
@@ -202,10 +207,7 @@ def test_coflow():
     # Critical cells correspond to critical cocells
     X = CubicalComplex([3, 4])
 
-    def grading(cell):
-        if X.cell_dim(cell) == 2:
-            return 1
-        return 0
+    grading = dim_grading(X, 2)
 
     grad_X = GradedComplex(X, grading)
     morse_X = MorseGradedComplex(grad_X, truncate=True, max_grade=0).complex()
@@ -230,13 +232,13 @@ def test_coflow():
         {17, 23, 27, 28, 33, 34, 35}, {0, 1, 2, 3, 4, 5}
     )
 
+    with pytest.raises(IndexError):
+        morse_X.coflow({-3})
+
 def test_colift_colower():
     X = CubicalComplex([3, 4])
 
-    def grading(cell):
-        if X.cell_dim(cell) == 2:
-            return 1
-        return 0
+    grading = dim_grading(X, 2)
 
     grad_X = GradedComplex(X, grading)
     morse_X = MorseGradedComplex(grad_X, truncate=True, max_grade=0).complex()
@@ -262,3 +264,21 @@ def test_colift_colower():
 
     assert morse_X.colower({12}) == {1}
     assert morse_X.colower({29}) == {3, 4}
+
+def test_lift_matrix():
+    pytest.importorskip("scipy")
+    X = CubicalComplex([3, 4])
+
+    grading = dim_grading(X, 2)
+
+    grad_X = GradedComplex(X, grading)
+    morse_X = MorseGradedComplex(grad_X, truncate=True, max_grade=0).complex()
+
+    lift = morse_X.lift_matrix()
+    colift = morse_X.colift_matrix()
+    assert lift.shape == colift.shape == (X.size(), morse_X.size())
+    chain = np.ones(morse_X.size(), dtype=np.int8)
+    assert set(np.flatnonzero(lift.dot(chain) % 2)) == \
+        morse_X.lift(set(morse_X))
+    assert set(np.flatnonzero(colift.dot(chain) % 2)) == \
+        morse_X.colift(set(morse_X))
@@ -19,11 +19,26 @@ def test_cubical_morse():
     assert list(X_morse_trunc.count().keys()) == [0]
 
     # 0 grade complex is fully reduced; boundary is the zero operator
+    values = X_morse.values()
     for cell in X_morse.complex():
-        assert X_morse.value(cell) == 1 or X_morse.complex().boundary({cell}) == set()
+        assert values[cell] == X_morse.value(cell)
+        assert values[cell] == 1 or X_morse.complex().boundary({cell}) == set()
 
     Y_morse = MorseGradedComplex(X_morse)
     Y_morse_trunc = MorseGradedComplex(Y_morse, truncate = True)
     assert Y_morse.count()[0] == X_morse.count()[0]
     assert Y_morse.count()[1] == [0, 0, 1]
     assert Y_morse_trunc.count() == X_morse_trunc.count()
+
+def test_morse_graded_complex_cache():
+    X = CubicalComplex([3, 4])
+    X_grad = GradedComplex(X, dim_grading(X, 2))
+
+    X_morse = MorseGradedComplex(X_grad, truncate=True, max_grade=0)
+    assert MorseGradedComplex(X_grad, truncate=True, max_grade=0) is X_morse
+    assert MorseGradedComplex(X_grad) is not X_morse
+
+    MorseGradedComplex.clear_cache()
+    X_morse_new = MorseGradedComplex(X_grad, truncate=True, max_grade=0)
+    assert X_morse_new is not X_morse
+    assert X_morse_new.count() == X_morse.count()